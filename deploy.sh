@@ -126,7 +126,9 @@ fi
 # Fallback to PyPI if vendored wheels failed or don't exist
 if [ "$DEPENDENCIES_INSTALLED" = false ]; then
     echo "[remote] Installing dependencies from PyPI..."
-    if .venv/bin/pip install -r requirements.txt; then
+    # Prefer release wheels: compiled extensions such as pydantic-core ship
+    # optimized (PGO) builds there, while a local sdist build would not be
+    if .venv/bin/pip install --prefer-binary -r requirements.txt; then
         echo "[remote] Successfully installed from PyPI"
         DEPENDENCIES_INSTALLED=true
     else
@@ -3,9 +3,10 @@
 ClickHouse Migration Manager
 Handles database schema migrations and DDL operations.
 """
+import hashlib
 import os
 import sys
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
 from datetime import datetime
 from pathlib import Path
 
@@ -13,8 +14,43 @@ from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from core.config import config
+from core.clickhouse import get_clickhouse_client
 from core.logging import log_with_timestamp
-import clickhouse_connect
+
+# Bookkeeping table recording which migration files have been executed
+MIGRATIONS_TABLE_DDL = """
+CREATE TABLE IF NOT EXISTS migrations (
+    id UInt32,
+    name String,
+    executed_at DateTime DEFAULT now(),
+    checksum String
+) ENGINE = MergeTree()
+ORDER BY id
+"""
+MIGRATIONS_INSERT_COLUMNS = ['id', 'name', 'checksum']
+MIGRATIONS_INSERT_TYPES = ['UInt32', 'String', 'String']
+
+
+def split_sql_statements(sql_content: str) -> List[str]:
+    """
+    Split a migration file into the statements that need to be sent.
+    
+    Chunks that contain only comments (such as a trailing comment after the
+    last semicolon) are dropped, since they would cost a round trip and
+    ClickHouse rejects them as empty queries.
+    
+    Args:
+        sql_content: Contents of a migration SQL file
+        
+    Returns:
+        List of statements to execute, in file order
+    """
+    statements = []
+    for chunk in sql_content.split(';'):
+        statement = chunk.strip()
+        if any(line.strip() and not line.strip().startswith('--') for line in statement.splitlines()):
+            statements.append(statement)
+    return statements
 
 
 class ClickHouseMigrationManager:
@@ -23,19 +59,15 @@ class ClickHouseMigrationManager:
     def __init__(self):
         self.config = config.get_clickhouse_config()
         self.client = None
+        # Names of executed migrations, loaded once per run_migrations call
+        self._executed_cache: Optional[Set[str]] = None
         self.migrations_dir = Path(__file__).parent / "sql"
         self.migrations_dir.mkdir(exist_ok=True)
         
     def connect(self):
         """Connect to ClickHouse database."""
         try:
-            self.client = clickhouse_connect.get_client(
-                host=self.config['host'],
-                port=self.config['port'],
-                username=self.config['user'],
-                password=self.config['password'],
-                database=self.config['database']
-            )
+            self.client = get_clickhouse_client()
             log_with_timestamp("Connected to ClickHouse successfully", "Migration Manager")
             return True
         except Exception as e:
@@ -44,18 +76,8 @@ class ClickHouseMigrationManager:
     
     def create_migrations_table(self):
         """Create the migrations tracking table."""
-        create_table_sql = """
-        CREATE TABLE IF NOT EXISTS migrations (
-            id UInt32,
-            name String,
-            executed_at DateTime DEFAULT now(),
-            checksum String
-        ) ENGINE = MergeTree()
-        ORDER BY id
-        """
-        
         try:
-            self.client.command(create_table_sql)
+            self.client.command(MIGRATIONS_TABLE_DDL)
             log_with_timestamp("Migrations table created/verified", "Migration Manager")
             return True
         except Exception as e:
@@ -71,13 +93,32 @@ class ClickHouseMigrationManager:
             log_with_timestamp(f"Failed to get executed migrations: {e}", "Migration Manager", "error")
             return []
     
+    def _load_executed_migrations(self) -> Optional[List[str]]:
+        """
+        Read executed migrations, creating the tracking table only if it is missing.
+        
+        Once the table exists this is a single round trip, instead of an
+        unconditional CREATE TABLE IF NOT EXISTS followed by the read.
+        
+        Returns:
+            Executed migration names in order, or None if the table could not be created
+        """
+        try:
+            qr = self.client.query("SELECT name FROM migrations ORDER BY id")
+            return [row[0] for row in qr.result_rows]
+        except Exception:
+            # First run: the tracking table does not exist yet
+            if not self.create_migrations_table():
+                return None
+            return []
+    
     def get_pending_migrations(self) -> List[Path]:
         """Get list of pending migration files."""
         if not self.migrations_dir.exists():
             return []
         
         migration_files = sorted(self.migrations_dir.glob("*.sql"))
-        executed = self.get_executed_migrations()
+        executed = self._executed_cache if self._executed_cache is not None else set(self.get_executed_migrations())
         
         pending = []
         for migration_file in migration_files:
@@ -86,28 +127,45 @@ class ClickHouseMigrationManager:
         
         return pending
     
-    def execute_migration(self, migration_file: Path) -> bool:
-        """Execute a single migration file."""
-        try:
-            with open(migration_file, 'r') as f:
-                sql_content = f.read()
+    def execute_migration(self, migration_file: Path, migration_id: Optional[int] = None) -> bool:
+        """
+        Execute a single migration file.
+        
+        Args:
+            migration_file: Path to the migration SQL file
+            migration_id: Id to record the migration under (queried from the migrations table if not provided)
             
-            # Split by semicolon and execute each statement
-            statements = [stmt.strip() for stmt in sql_content.split(';') if stmt.strip()]
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            sql_bytes = migration_file.read_bytes()
+            sql_content = sql_bytes.decode('utf-8')
             
-            for statement in statements:
-                if statement:
-                    self.client.command(statement)
+            # ClickHouse runs one statement per request, so send each one separately
+            for statement in split_sql_statements(sql_content):
+                self.client.command(statement)
             
             # Record migration as executed
             migration_name = migration_file.stem
-            checksum = str(hash(sql_content))
+            # Deterministic across runs, unlike hash(), so stored checksums can be compared
+            checksum = hashlib.sha1(sql_bytes).hexdigest()
             
-            self.client.command(
-                f"INSERT INTO migrations (id, name, checksum) VALUES ({len(self.get_executed_migrations()) + 1}, '{migration_name}', '{checksum}')"
+            if migration_id is None:
+                migration_id = len(self.get_executed_migrations()) + 1
+            
+            # Typed binary insert: no VALUES parsing and no schema lookup round trip
+            self.client.insert(
+                'migrations',
+                [[migration_id, migration_name, checksum]],
+                column_names=MIGRATIONS_INSERT_COLUMNS,
+                column_type_names=MIGRATIONS_INSERT_TYPES
             )
             
-            log_with_timestamp(f"Executed migration: {migration_name}", "Migration Manager")
+            if self._executed_cache is not None:
+                self._executed_cache.add(migration_name)
+            
+            log_with_timestamp("Executed migration: %s", "Migration Manager", "debug", migration_name)
             return True
             
         except Exception as e:
@@ -119,35 +177,40 @@ class ClickHouseMigrationManager:
         if not self.connect():
             return False
         
-        if not self.create_migrations_table():
+        # Read the migrations table once and track progress in memory
+        executed = self._load_executed_migrations()
+        if executed is None:
             return False
-        
-        pending_migrations = self.get_pending_migrations()
-        
-        if not pending_migrations:
-            log_with_timestamp("No pending migrations", "Migration Manager")
+        self._executed_cache = set(executed)
+        try:
+            pending_migrations = self.get_pending_migrations()
+            
+            if not pending_migrations:
+                log_with_timestamp("No pending migrations", "Migration Manager")
+                return True
+            
+            log_with_timestamp(f"Found {len(pending_migrations)} pending migrations", "Migration Manager")
+            
+            next_id = len(executed) + 1
+            for offset, migration_file in enumerate(pending_migrations):
+                if not self.execute_migration(migration_file, next_id + offset):
+                    log_with_timestamp(f"Migration failed: {migration_file.name}", "Migration Manager", "error")
+                    return False
+            
+            log_with_timestamp("All migrations completed successfully", "Migration Manager")
             return True
-        
-        log_with_timestamp(f"Found {len(pending_migrations)} pending migrations", "Migration Manager")
-        
-        for migration_file in pending_migrations:
-            if not self.execute_migration(migration_file):
-                log_with_timestamp(f"Migration failed: {migration_file.name}", "Migration Manager", "error")
-                return False
-        
-        log_with_timestamp("All migrations completed successfully", "Migration Manager")
-        return True
+        finally:
+            self._executed_cache = None
     
     def rollback_migrations(self, count: int = 1) -> bool:
         """Rollback the last N migrations."""
         if not self.connect():
             return False
         
-        if not self.create_migrations_table():
+        executed = self._load_executed_migrations()
+        if executed is None:
             return False
         
-        executed = self.get_executed_migrations()
-        
         if not executed:
             log_with_timestamp("No migrations to rollback", "Migration Manager")
             return True
@@ -160,7 +223,10 @@ class ClickHouseMigrationManager:
         try:
             # Remove the migration records from the database
             for migration_name in migrations_to_rollback:
-                self.client.command(f"DELETE FROM migrations WHERE name = '{migration_name}'")
+                self.client.command(
+                    "DELETE FROM migrations WHERE name = %(name)s",
+                    parameters={'name': migration_name}
+                )
                 log_with_timestamp(f"Rolled back migration: {migration_name}", "Migration Manager")
             
             log_with_timestamp("Rollback completed successfully", "Migration Manager")
@@ -6,19 +6,27 @@ This script is independent from pipelines and just triggers jobs directly.
 import sys
 import os
 import argparse
+import asyncio
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Set
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from core.logging import setup_logging, log_with_timestamp
+from core.clickhouse import get_clickhouse_client, get_table_row_counts
 from core.config import config
-from main import run_cron_job, list_cron_jobs, register_all_pipelines
+from main import run_cron_job, list_cron_jobs, register_all_pipelines, ensure_database_schema, install_event_loop_policy
+
+@lru_cache(maxsize=1)
+def _ensure_registered() -> None:
+    """Register all pipelines once per process."""
+    register_all_pipelines()
 
 def get_available_jobs() -> List[str]:
     """Get list of available jobs for backfill."""
-    register_all_pipelines()
+    _ensure_registered()
     return list(list_cron_jobs().keys())
 
 def run_job_for_date_range(job_name: str, start_date: datetime, end_date: datetime) -> bool:
@@ -46,12 +54,14 @@ def run_job_for_date_range(job_name: str, start_date: datetime, end_date: dateti
         log_with_timestamp(f"Error running {job_name}: {e}", "Backfill", "error")
         return False
 
-def backfill_job(job_name: str, days: int) -> bool:
+def backfill_job(job_name: str, days: int, available_jobs: Optional[Set[str]] = None) -> bool:
     """
     Backfill a specific job for the specified number of days.
     """
-    if job_name not in get_available_jobs():
-        log_with_timestamp(f"Job '{job_name}' not available. Available jobs: {', '.join(get_available_jobs())}", "Backfill", "error")
+    if available_jobs is None:
+        available_jobs = set(get_available_jobs())
+    if job_name not in available_jobs:
+        log_with_timestamp(f"Job '{job_name}' not available. Available jobs: {', '.join(sorted(available_jobs))}", "Backfill", "error")
         return False
     
     log_with_timestamp(f"Starting backfill for {job_name} for {days} days", "Backfill")
@@ -79,11 +89,26 @@ def backfill_all_jobs(days: int) -> bool:
     available_jobs = get_available_jobs()
     log_with_timestamp(f"Starting backfill for all jobs: {', '.join(available_jobs)}", "Backfill")
     
-    results = {}
-    for job_name in available_jobs:
-        log_with_timestamp(f"Backfilling {job_name}...", "Backfill")
-        success = backfill_job(job_name, days)
-        results[job_name] = success
+    job_set = set(available_jobs)
+    # Apply pending migrations up front so concurrent jobs do not race on them;
+    # the jobs' own schema checks then return without querying the database
+    if not ensure_database_schema():
+        log_with_timestamp("Database schema check failed, skipping backfill", "Backfill", "error")
+        return False
+    concurrency = config.get_int('BACKFILL_CONCURRENCY', 4)
+    
+    async def _backfill_concurrently() -> Dict[str, bool]:
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _one(job_name: str):
+            async with semaphore:
+                log_with_timestamp(f"Backfilling {job_name}...", "Backfill")
+                # Jobs are synchronous and run their own event loop, so each gets a worker thread
+                return job_name, await asyncio.to_thread(backfill_job, job_name, days, job_set)
+        
+        return dict(await asyncio.gather(*(_one(job_name) for job_name in available_jobs)))
+    
+    results = asyncio.run(_backfill_concurrently())
     
     # Summary
     successful_jobs = [job for job, success in results.items() if success]
@@ -102,33 +127,12 @@ def backfill_all_jobs(days: int) -> bool:
 def show_data_counts():
     """Show data counts in the database."""
     try:
-        import clickhouse_connect
-        
-        ch_config = config.get_clickhouse_config()
-        client = clickhouse_connect.get_client(
-            host=ch_config['host'],
-            port=ch_config['port'],
-            username=ch_config['user'],
-            password=ch_config['password'],
-            database=ch_config['database']
-        )
+        client = get_clickhouse_client()
         
         log_with_timestamp("Data counts in database:", "Backfill")
         
-        # Get all tables
-        try:
-            qr = client.query("SHOW TABLES")
-            tables = [row[0] for row in qr.result_rows] if qr.result_rows else []
-        except:
-            tables = []
-        
-        for table in tables:
-            try:
-                qr = client.query(f"SELECT COUNT(*) FROM {table}")
-                count = qr.result_rows[0][0] if qr.result_rows else 0
-                log_with_timestamp(f"  {table}: {count} records", "Backfill")
-            except Exception as e:
-                log_with_timestamp(f"  {table}: Error - {e}", "Backfill", "warning")
+        for table, count in get_table_row_counts(client).items():
+            log_with_timestamp(f"  {table}: {count if count is not None else 'n/a'} records", "Backfill")
                 
     except Exception as e:
         log_with_timestamp(f"Error checking data counts: {e}", "Backfill", "error")
@@ -137,6 +141,7 @@ def main():
     """Main entry point."""
     # Setup logging
     setup_logging(config.log_level, config.log_file)
+    install_event_loop_policy()
     
     parser = argparse.ArgumentParser(description='Backfill historical data')
     parser.add_argument('command', choices=['backfill', 'backfill_all', 'list_jobs', 'counts'], 
@@ -162,9 +167,10 @@ def main():
             log_with_timestamp("Please specify jobs to backfill using --jobs", "Backfill", "error")
             sys.exit(1)
         
+        available_jobs = set(get_available_jobs())
         success = True
         for job in args.jobs:
-            if not backfill_job(job, args.days):
+            if not backfill_job(job, args.days, available_jobs):
                 success = False
         
         sys.exit(0 if success else 1)
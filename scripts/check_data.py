@@ -1,34 +1,34 @@
 #!/usr/bin/env python3
 import sys
 import os
+import argparse
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from core.config import config
-import clickhouse_connect
+from core.clickhouse import get_clickhouse_client, get_table_row_counts
+
+def check_data(exact: bool = False):
+    client = get_clickhouse_client()
+
+    # Row counts for all tables come from the catalog in one query
+    counts = get_table_row_counts(client)
+    counts.pop('migrations', None)
 
-def check_data():
-    ch_config = config.get_clickhouse_config()
-    client = clickhouse_connect.get_client(
-        host=ch_config['host'],
-        port=ch_config['port'],
-        username=ch_config['user'],
-        password=ch_config['password']
-    )
-    
-    # Get all tables in the database
-    tables_result = client.query("SHOW TABLES").result_rows
-    tables = [row[0] for row in tables_result if row[0] != 'migrations']
-    
     print("=== Data Counts ===")
-    for table in tables:
-        try:
-            qr = client.query(f"SELECT COUNT(*) FROM data_warehouse.{table}")
-            count = qr.result_rows[0][0]
-            print(f"{table:20} {count}")
-        except Exception as e:
-            print(f"{table:20} ERROR: {e}")
+    for table, count in counts.items():
+        if exact:
+            # FINAL collapses rows ReplacingMergeTree has not merged yet
+            try:
+                count = client.command(f"SELECT count() FROM {table} FINAL")
+            except Exception as e:
+                print(f"{table:20} ERROR: {e}")
+                continue
+        print(f"{table:20} {count if count is not None else 'n/a'}")
 
 if __name__ == "__main__":
-    check_data()
+    parser = argparse.ArgumentParser(description='Show row counts of data warehouse tables')
+    parser.add_argument('--exact', action='store_true',
+                        help='Count deduplicated rows with FINAL (scans each table)')
+    args = parser.parse_args()
+    check_data(exact=args.exact)
 
 
@@ -11,9 +11,9 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'samples'))
 
-from core.logging import setup_logging, log_with_timestamp, get_job_log_path
+from core.logging import setup_logging, log_with_timestamp, get_job_log_path, BufferedHandler, BufferedFileHandler, TehranFormatter
 from core.config import config
-from main import run_cron_job, list_cron_jobs, register_cron_job
+from main import run_cron_job, list_cron_jobs, register_cron_job, install_event_loop_policy
 
 # Import pipelines - domain-specific pipelines should be added here
 # from pipelines.example_pipeline import register_example_pipelines
@@ -57,6 +57,7 @@ def main():
     """Main entry point."""
     # Setup logging (high-level app log)
     setup_logging(config.log_level, config.log_file)
+    install_event_loop_policy()
     
     log_with_timestamp("Starting Data Processing Framework", "Run Script")
     
@@ -76,16 +77,25 @@ def main():
             return
         pipeline_name = sys.argv[2]
         # Switch to per-job log file temporarily
-        from logging import getLogger, FileHandler
+        from logging import getLogger
         import logging as _logging
         job_log_path = get_job_log_path(pipeline_name)
-        fh = FileHandler(job_log_path)
+        fh = BufferedFileHandler(
+            job_log_path,
+            max_bytes=config.get('LOG_MAX_BYTES', 0),
+            backup_count=config.get('LOG_BACKUP_COUNT', 0)
+        )
         fh.setLevel(_logging.DEBUG)
-        fh.setFormatter(_logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s'))
+        fh.setFormatter(TehranFormatter('[%(asctime)s] %(levelname)s: %(message)s'))
+        # Buffer job log writes; closing flushes what is left and closes the file
+        job_handler = BufferedHandler(fh)
         root_logger = getLogger()
-        root_logger.addHandler(fh)
-        run_pipeline(pipeline_name)
-        root_logger.removeHandler(fh)
+        root_logger.addHandler(job_handler)
+        try:
+            run_pipeline(pipeline_name)
+        finally:
+            root_logger.removeHandler(job_handler)
+            job_handler.close()
     elif command == "list":
         list_available_pipelines()
     else:
@@ -12,6 +12,8 @@ Example:
     >>> log_with_timestamp('Application started', 'Main')
 """
 
+import importlib
+
 from .config import config
 from .logging import (
     setup_logging, log_with_timestamp, get_logger,
@@ -28,21 +30,68 @@ from .exceptions import (
     PipelineError, ExtractionError, TransformationError,
     LoadingError, MigrationError, ValidationError
 )
-from .validators import (
-    validate_config as validate_config_legacy, validate_log_level, validate_time_scope,
-    validate_url, validate_file_path, validate_dataframe as validate_dataframe_legacy
-)
-from .pydantic_validators import (
-    PydanticValidator, validate_config, validate_pipeline_config,
-    validate_extractor_config, validate_transformer_config, validate_loader_config,
-    validate_database_config, validate_api_config, validate_dataframe,
-    validate_job_execution, safe_validate
-)
-from .models import (
-    FrameworkSettings, PipelineConfig, PipelineData,
-    ExtractorConfig, TransformerConfig, LoaderConfig,
-    JobExecution, DatabaseConfig, APIConfig, ValidationResult, DataFrameInfo
-)
+
+# Public names imported on first access (PEP 562) so that importing core does not
+# pull in pandas and the validation modules: name -> (submodule, attribute)
+_LAZY_IMPORTS = {
+    'get_clickhouse_client': ('.clickhouse', 'get_clickhouse_client'),
+    
+    # Legacy Validators
+    'validate_config_legacy': ('.validators', 'validate_config'),
+    'validate_log_level': ('.validators', 'validate_log_level'),
+    'validate_time_scope': ('.validators', 'validate_time_scope'),
+    'validate_url': ('.validators', 'validate_url'),
+    'validate_file_path': ('.validators', 'validate_file_path'),
+    'validate_dataframe_legacy': ('.validators', 'validate_dataframe'),
+    
+    # Pydantic Validators
+    'PydanticValidator': ('.pydantic_validators', 'PydanticValidator'),
+    'validate_config': ('.pydantic_validators', 'validate_config'),
+    'validate_pipeline_config': ('.pydantic_validators', 'validate_pipeline_config'),
+    'validate_extractor_config': ('.pydantic_validators', 'validate_extractor_config'),
+    'validate_transformer_config': ('.pydantic_validators', 'validate_transformer_config'),
+    'validate_loader_config': ('.pydantic_validators', 'validate_loader_config'),
+    'validate_database_config': ('.pydantic_validators', 'validate_database_config'),
+    'validate_api_config': ('.pydantic_validators', 'validate_api_config'),
+    'validate_dataframe': ('.pydantic_validators', 'validate_dataframe'),
+    'validate_job_execution': ('.pydantic_validators', 'validate_job_execution'),
+    'safe_validate': ('.pydantic_validators', 'safe_validate'),
+    
+    # Pydantic Models
+    'FrameworkSettings': ('.models', 'FrameworkSettings'),
+    'PipelineConfig': ('.models', 'PipelineConfig'),
+    'PipelineData': ('.models', 'PipelineData'),
+    'ExtractorConfig': ('.models', 'ExtractorConfig'),
+    'HTTPExtractorConfig': ('.models', 'HTTPExtractorConfig'),
+    'ClickHouseExtractorConfig': ('.models', 'ClickHouseExtractorConfig'),
+    'FileExtractorConfig': ('.models', 'FileExtractorConfig'),
+    'TransformerConfig': ('.models', 'TransformerConfig'),
+    'LoaderConfig': ('.models', 'LoaderConfig'),
+    'ClickHouseLoaderConfig': ('.models', 'ClickHouseLoaderConfig'),
+    'ConsoleLoaderConfig': ('.models', 'ConsoleLoaderConfig'),
+    'FileLoaderConfig': ('.models', 'FileLoaderConfig'),
+    'JobExecution': ('.models', 'JobExecution'),
+    'DatabaseConfig': ('.models', 'DatabaseConfig'),
+    'APIConfig': ('.models', 'APIConfig'),
+    'ValidationResult': ('.models', 'ValidationResult'),
+    'DataFrameInfo': ('.models', 'DataFrameInfo'),
+}
+
+
+def __getattr__(name: str):
+    """Import a lazily exported name from its submodule and cache it on the package."""
+    try:
+        module_name, attribute = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 # Package metadata
 __version__ = FRAMEWORK_VERSION
@@ -54,6 +103,7 @@ __description__ = "Enterprise-grade data processing framework"
 __all__ = [
     # Core functionality
     'config',
+    'get_clickhouse_client',
     'setup_logging', 
     'log_with_timestamp',
     'get_logger',
@@ -111,8 +161,14 @@ __all__ = [
     'PipelineConfig',
     'PipelineData',
     'ExtractorConfig',
+    'HTTPExtractorConfig',
+    'ClickHouseExtractorConfig',
+    'FileExtractorConfig',
     'TransformerConfig',
     'LoaderConfig',
+    'ClickHouseLoaderConfig',
+    'ConsoleLoaderConfig',
+    'FileLoaderConfig',
     'JobExecution',
     'DatabaseConfig',
     'APIConfig',
@@ -0,0 +1,228 @@
+# src/core/clickhouse.py
+"""
+ClickHouse client factory for the data processing framework.
+
+This module centralizes how ClickHouse connections are created so that
+loaders, migrations and scripts share the same connection settings.
+
+Example:
+    >>> from core.clickhouse import get_clickhouse_client
+    >>> client = get_clickhouse_client()
+    >>> client.query("SELECT 1").result_rows
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .config import config
+
+# Clients reused by get_shared_clickhouse_client, one cache per thread
+_thread_clients = threading.local()
+
+# HTTP connection pool shared by every client in this process
+_pool_manager = None
+_pool_manager_pid = None
+_pool_manager_lock = threading.Lock()
+
+
+def _get_pool_manager(pool_size: int):
+    """
+    Get the process-wide HTTP connection pool for ClickHouse clients.
+    
+    Per-thread clients all draw keep-alive connections from this pool, so inserts
+    issued from asyncio.to_thread workers reuse sockets instead of reconnecting
+    once more threads are busy than the driver's default pool of 8 can hold.
+    urllib3 pools are not fork-safe, so a forked child builds its own.
+    
+    Args:
+        pool_size: Connections kept open per ClickHouse host
+        
+    Returns:
+        urllib3 PoolManager instance
+    """
+    global _pool_manager, _pool_manager_pid
+    from clickhouse_connect.driver.httputil import get_pool_manager
+    
+    with _pool_manager_lock:
+        if _pool_manager is None or _pool_manager_pid != os.getpid():
+            _pool_manager = get_pool_manager(maxsize=pool_size)
+            _pool_manager_pid = os.getpid()
+        return _pool_manager
+
+
+def get_clickhouse_client(
+    host: str = None,
+    port: int = None,
+    user: str = None,
+    password: str = None,
+    database: str = None,
+    **kwargs: Any
+):
+    """
+    Create a ClickHouse client using the framework configuration.
+
+    Request and response bodies are compressed on the wire with the configured
+    CLICKHOUSE_COMPRESSION codec (LZ4 by default; "none" disables it). Clients
+    share one connection pool of CLICKHOUSE_POOL_SIZE connections per host.
+
+    Args:
+        host: ClickHouse host (uses config if not provided)
+        port: ClickHouse HTTP port (uses config if not provided)
+        user: ClickHouse username (uses config if not provided)
+        password: ClickHouse password (uses config if not provided)
+        database: ClickHouse database (uses config if not provided)
+        **kwargs: Additional arguments passed to clickhouse_connect.get_client
+
+    Returns:
+        clickhouse_connect client instance
+    """
+    import clickhouse_connect
+
+    clickhouse_config = config.get_clickhouse_config()
+    compression = clickhouse_config.get('compression', 'lz4')
+    kwargs.setdefault('compress', False if compression == 'none' else compression)
+    if 'pool_mgr' not in kwargs:
+        kwargs['pool_mgr'] = _get_pool_manager(clickhouse_config.get('pool_size', 16))
+    return clickhouse_connect.get_client(
+        host=host or clickhouse_config['host'],
+        port=port or clickhouse_config['port'],
+        username=user or clickhouse_config['user'],
+        password=password or clickhouse_config['password'],
+        database=database or clickhouse_config['database'],
+        **kwargs
+    )
+
+
+def get_shared_clickhouse_client(
+    host: str = None,
+    port: int = None,
+    user: str = None,
+    password: str = None,
+    database: str = None,
+    **kwargs: Any
+):
+    """
+    Get a ClickHouse client that is reused for the same connection settings.
+    
+    Clients are cached per thread, since a clickhouse_connect client must not
+    run queries from several threads at once. Reusing them skips the
+    connection setup and server handshake that get_clickhouse_client performs
+    on every call, which matters for loaders invoked once per batch.
+    
+    Args:
+        host: ClickHouse host (uses config if not provided)
+        port: ClickHouse HTTP port (uses config if not provided)
+        user: ClickHouse username (uses config if not provided)
+        password: ClickHouse password (uses config if not provided)
+        database: ClickHouse database (uses config if not provided)
+        **kwargs: Additional arguments passed to clickhouse_connect.get_client
+        
+    Returns:
+        clickhouse_connect client instance
+    """
+    clickhouse_config = config.get_clickhouse_config()
+    connection = (
+        host or clickhouse_config['host'],
+        port or clickhouse_config['port'],
+        user or clickhouse_config['user'],
+        password or clickhouse_config['password'],
+        database or clickhouse_config['database'],
+    )
+    key = connection + tuple(sorted(kwargs.items()))
+    
+    clients = getattr(_thread_clients, 'clients', None)
+    if clients is None:
+        clients = _thread_clients.clients = {}
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = get_clickhouse_client(*connection, **kwargs)
+    return client
+
+
+def get_table_row_counts(client, database: str = None) -> Dict[str, Optional[int]]:
+    """
+    Get row counts for every table in a database with a single catalog query.
+    
+    Counts come from ``system.tables.total_rows``, which ClickHouse keeps from part
+    metadata, so no table is scanned. For ReplacingMergeTree tables the count
+    includes rows that have not been merged away yet.
+    
+    Args:
+        client: ClickHouse client to query with
+        database: Database name (uses config if not provided)
+        
+    Returns:
+        Dictionary mapping table name to row count (None for tables without a count, such as views)
+    """
+    database = database or config.get_clickhouse_config()['database']
+    result = client.query(
+        "SELECT name, total_rows FROM system.tables WHERE database = %(database)s ORDER BY name",
+        parameters={'database': database}
+    )
+    return dict(result.result_rows)
+
+
+class CircuitBreaker:
+    """
+    Fail fast after repeated ClickHouse write failures.
+    
+    The breaker opens once ``failure_threshold`` consecutive failures have been
+    recorded and rejects calls until ``cooldown`` seconds have passed; the next
+    call after the cool-down is let through, and its outcome closes or re-opens
+    the breaker. Safe to share between threads.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 60.0):
+        """
+        Initialize circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            cooldown: Seconds to reject calls once the breaker is open
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Return True if a call may be attempted now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.cooldown:
+                # Half-open: let one call probe the server
+                self._opened_at = None
+                self._failures = self.failure_threshold - 1
+                return True
+            return False
+    
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+    
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+# Shared by the ClickHouse loaders so concurrent pipelines back off together
+clickhouse_write_breaker = CircuitBreaker()
+
+
+# Public API
+__all__ = [
+    'CircuitBreaker',
+    'clickhouse_write_breaker',
+    'get_clickhouse_client',
+    'get_shared_clickhouse_client',
+    'get_table_row_counts',
+]
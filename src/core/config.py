@@ -8,7 +8,9 @@ variable loading.
 """
 
 import os
-from typing import Dict, Any, Optional, Union, TypeVar
+import re
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Union, TypeVar
 from pathlib import Path
 
 from .models import FrameworkSettings
@@ -17,6 +19,49 @@ from .exceptions import ConfigurationError
 # Type variable for generic configuration access
 T = TypeVar('T')
 
+# .env files already loaded into the process environment
+_LOADED_ENV_FILES = set()
+
+# KEY=value assignments in a .env file; comment lines and lines without '=' never match,
+# and surrounding whitespace is left outside both groups
+_ENV_LINE_RE = re.compile(rb'^[ \t]*([^#\s=][^=\r\n]*?)[ \t]*=[ \t]*(.*?)[ \t]*\r?$', re.MULTILINE)
+
+
+def load_env_file(path: Union[str, Path] = '.env') -> Dict[str, str]:
+    """
+    Load variables from a .env file into the process environment.
+    
+    The file is read once per process as bytes and parsed with a single regex scan.
+    Variables already set in the environment take precedence over the file.
+    
+    Args:
+        path: Path to the .env file
+        
+    Returns:
+        Dictionary of variables parsed from the file (empty if already loaded or missing)
+    """
+    env_path = os.path.abspath(path)
+    if env_path in _LOADED_ENV_FILES:
+        return {}
+    _LOADED_ENV_FILES.add(env_path)
+    
+    try:
+        with open(env_path, 'rb') as env_file:
+            text = env_file.read()
+    except OSError:
+        return {}
+    
+    values = {}
+    for key, value in _ENV_LINE_RE.findall(text):
+        if len(value) >= 2 and value[:1] == value[-1:] and value[:1] in (b'"', b"'"):
+            value = value[1:-1]
+        values[key.decode()] = value.decode()
+    
+    for key, value in values.items():
+        os.environ.setdefault(key, value)
+    return values
+
+
 class Config:
     """
     Configuration manager using Pydantic BaseSettings.
@@ -29,7 +74,8 @@ class Config:
     def __init__(self) -> None:
         """Initialize configuration with Pydantic validation."""
         try:
-            self._settings = FrameworkSettings()
+            load_env_file()
+            self._set_settings(FrameworkSettings())
         except Exception as e:
             raise ConfigurationError(
                 f"Failed to load configuration: {e}",
@@ -41,10 +87,26 @@ class Config:
         """Get the underlying Pydantic settings model."""
         return self._settings
     
+    def _set_settings(self, settings: FrameworkSettings) -> None:
+        """Install a validated settings model and snapshot its values for get()."""
+        self._settings = settings
+        self._values = settings.model_dump()
+        self._snapshot = MappingProxyType(self._values)
+    
+    @property
+    def snapshot(self) -> Mapping[str, Any]:
+        """
+        Get a read-only view of the current settings, keyed by lowercase field name.
+        
+        Reads are plain mapping lookups that bypass the Pydantic model. The view is
+        replaced, not mutated, when the configuration is reloaded or updated.
+        """
+        return self._snapshot
+    
     def reload(self) -> None:
         """Reload configuration from environment variables."""
         try:
-            self._settings = FrameworkSettings()
+            self._set_settings(FrameworkSettings())
         except Exception as e:
             raise ConfigurationError(
                 f"Failed to reload configuration: {e}",
@@ -62,15 +124,9 @@ class Config:
         Returns:
             Configuration value or default
         """
-        # Convert key to lowercase to match Pydantic field names
-        key_lower = key.lower()
-        
-        # Try to get the value from the Pydantic model
-        if hasattr(self._settings, key_lower):
-            return getattr(self._settings, key_lower)
-        
-        # Fallback to default
-        return default
+        # Keys are matched against the lowercase Pydantic field names with a
+        # single dict lookup instead of hasattr() + getattr() on the model
+        return self._values.get(key.lower(), default)
     
     def get_str(self, key: str, default: str = '') -> str:
         """Get a string configuration value."""
@@ -134,7 +190,9 @@ class Config:
             'user': self._settings.clickhouse_user,
             'password': self._settings.clickhouse_password,
             'database': self._settings.clickhouse_database,
-            'timeout': self._settings.clickhouse_timeout
+            'timeout': self._settings.clickhouse_timeout,
+            'compression': self._settings.clickhouse_compression,
+            'pool_size': self._settings.clickhouse_pool_size
         }
 
     def get_api_config(self) -> Optional[Dict[str, Any]]:
@@ -173,7 +231,7 @@ class Config:
         Returns:
             Dictionary representation of configuration
         """
-        return self._settings.model_dump()
+        return dict(self._values)
     
     def update(self, **kwargs) -> None:
         """
@@ -187,9 +245,9 @@ class Config:
         """
         try:
             # Create new settings with updated values
-            current_dict = self._settings.model_dump()
+            current_dict = dict(self._values)
             current_dict.update(kwargs)
-            self._settings = FrameworkSettings(**current_dict)
+            self._set_settings(FrameworkSettings(**current_dict))
         except Exception as e:
             raise ConfigurationError(
                 f"Failed to update configuration: {e}",
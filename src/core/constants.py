@@ -18,7 +18,7 @@ FRAMEWORK_AUTHOR = "Data Processing Framework Team"
 DEFAULT_CONFIG: Dict[str, Any] = {
     'LOG_LEVEL': 'INFO',
     'TIMEOUT': 30,
-    'BATCH_SIZE': 1000,
+    'BATCH_SIZE': 10000,
     'MAX_RETRIES': 3,
     'RETRY_DELAY': 1.0,
     'RETRY_BACKOFF': 2.0,
@@ -34,6 +34,17 @@ DEFAULT_CLICKHOUSE_CONFIG: Dict[str, Any] = {
     'send_receive_timeout': 300,
 }
 
+# Server-side buffered inserts: ClickHouse coalesces small writes into large parts
+CLICKHOUSE_ASYNC_INSERT_SETTINGS: Dict[str, Any] = {
+    'async_insert': 1,
+    'wait_for_async_insert': 0,
+    'async_insert_busy_timeout_ms': 1000,
+    'async_insert_max_data_size': 10_000_000,
+}
+
+# Wire compression codecs accepted by CLICKHOUSE_COMPRESSION ('none' disables it)
+CLICKHOUSE_COMPRESSION_CODECS = ['lz4', 'zstd', 'gzip', 'br', 'none']
+
 # Logging configuration
 LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
 LOG_FORMATS = {
@@ -7,12 +7,16 @@ better error handling and debugging capabilities throughout the
 framework.
 """
 
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 
 
 class FrameworkError(Exception):
     """Base exception class for all framework-related errors."""
     
+    # Slots keep the per-instance attribute dict from being allocated
+    __slots__ = ('message', 'details')
+    
     def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
         """
         Initialize framework error.
@@ -149,6 +153,8 @@ class TimeoutError(FrameworkError):
 class RetryError(FrameworkError):
     """Raised when all retry attempts fail."""
     
+    __slots__ = ('attempts', 'last_error')
+    
     def __init__(self, message: str, attempts: int, last_error: Exception, details: Optional[Dict[str, Any]] = None):
         """
         Initialize retry error.
@@ -164,16 +170,16 @@ class RetryError(FrameworkError):
         self.last_error = last_error
     
     def __str__(self) -> str:
-        base_msg = f"{self.message} (after {self.attempts} attempts)"
+        parts = [f"{self.message} (after {self.attempts} attempts)"]
         if self.last_error:
-            base_msg += f" | Last error: {self.last_error}"
+            parts.append(f" | Last error: {self.last_error}")
         if self.details:
-            base_msg += f" | Details: {self.details}"
-        return base_msg
+            parts.append(f" | Details: {self.details}")
+        return ''.join(parts)
 
 
-# Exception mapping for better error categorization
-EXCEPTION_MAPPING = {
+# Exception mapping for better error categorization (read-only)
+EXCEPTION_MAPPING = MappingProxyType({
     'config': ConfigurationError,
     'database': DatabaseError,
     'database_connection': DatabaseConnectionError,
@@ -197,7 +203,7 @@ EXCEPTION_MAPPING = {
     'cron_schedule': CronScheduleError,
     'timeout': TimeoutError,
     'retry': RetryError,
-}
+})
 
 
 def get_exception_class(error_type: str) -> type:
@@ -213,9 +219,10 @@ def get_exception_class(error_type: str) -> type:
     Raises:
         ValueError: If error type is not found
     """
-    if error_type not in EXCEPTION_MAPPING:
+    exception_class = EXCEPTION_MAPPING.get(error_type)
+    if exception_class is None:
         raise ValueError(f"Unknown error type: {error_type}")
-    return EXCEPTION_MAPPING[error_type]
+    return exception_class
 
 
 def create_exception(error_type: str, message: str, details: Optional[Dict[str, Any]] = None) -> FrameworkError:
@@ -234,9 +241,5 @@ def create_exception(error_type: str, message: str, details: Optional[Dict[str,
         >>> exc = create_exception('database_connection', 'Failed to connect', {'host': 'localhost'})
         >>> raise exc
     """
-    try:
-        exception_class = get_exception_class(error_type)
-        return exception_class(message, details)
-    except ValueError:
-        # Fall back to FrameworkError for unknown types
-        return FrameworkError(message, details)
+    # Fall back to FrameworkError for unknown types
+    return EXCEPTION_MAPPING.get(error_type, FrameworkError)(message, details)
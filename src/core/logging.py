@@ -1,98 +1,268 @@
 # src/core/logging.py
+import atexit
+import functools
 import logging
-from datetime import datetime, timezone, timedelta
+import logging.handlers
+import queue
+import threading
+import time
+from contextvars import ContextVar
+from datetime import timezone, timedelta
 import os
+from typing import Any, Dict, Optional
 from core.config import config
 
-# Ensure logs directory exists (project /logs by default, fallback to ./logs if not writable)
-LOG_DIR = config.get('LOG_DIR')
-try:
-    os.makedirs(LOG_DIR, exist_ok=True)
-    test_path = os.path.join(LOG_DIR, '.write_test')
-    with open(test_path, 'w') as _f:
-        _f.write('ok')
-    os.remove(test_path)
-except Exception:
-    LOG_DIR = os.path.join(os.getcwd(), 'logs')
-    os.makedirs(LOG_DIR, exist_ok=True)
-
-# Structured log subdirectories
-SYSTEM_LOG_DIR = os.path.join(LOG_DIR, 'system')
-JOB_LOG_DIR = os.path.join(LOG_DIR, 'jobs')
-os.makedirs(SYSTEM_LOG_DIR, exist_ok=True)
-os.makedirs(JOB_LOG_DIR, exist_ok=True)
-
-
-def setup_logging(level: str = 'INFO', log_file: str = None):
-    """
-    Sets up global logging configuration.
+# Tehran is UTC+3:30
+TEHRAN_TZ = timezone(timedelta(hours=3, minutes=30))
+_TEHRAN_OFFSET_SECONDS = int(TEHRAN_TZ.utcoffset(None).total_seconds())
+
+# Prepared log directories: configured LOG_DIR -> (log dir, system dir, job dir)
+_LOG_DIRS_READY = {}
+
+
+def _prepare_log_dirs(configured_dir: str):
     """
-    # Reinitialize log directories in case LOG_DIR environment variable changed
-    global LOG_DIR, SYSTEM_LOG_DIR, JOB_LOG_DIR
+    Create the log directory tree for a configured LOG_DIR, once per process.
     
-    # Reload config to pick up any environment variable changes
-    config.reload()
+    Falls back to ./logs if the configured directory is not writable. Later calls
+    with the same configured directory return the cached result without touching
+    the filesystem.
     
-    LOG_DIR = config.get('LOG_DIR')
+    Args:
+        configured_dir: LOG_DIR from configuration
+        
+    Returns:
+        Tuple of (log dir, system log dir, job log dir)
+    """
+    prepared = _LOG_DIRS_READY.get(configured_dir)
+    if prepared is not None:
+        return prepared
+    
+    log_dir = configured_dir
     try:
-        os.makedirs(LOG_DIR, exist_ok=True)
-        test_path = os.path.join(LOG_DIR, '.write_test')
+        os.makedirs(log_dir, exist_ok=True)
+        test_path = os.path.join(log_dir, '.write_test')
         with open(test_path, 'w') as _f:
             _f.write('ok')
         os.remove(test_path)
     except Exception:
-        LOG_DIR = os.path.join(os.getcwd(), 'logs')
-        os.makedirs(LOG_DIR, exist_ok=True)
-
+        log_dir = os.path.join(os.getcwd(), 'logs')
+        os.makedirs(log_dir, exist_ok=True)
+    
     # Structured log subdirectories
-    SYSTEM_LOG_DIR = os.path.join(LOG_DIR, 'system')
-    JOB_LOG_DIR = os.path.join(LOG_DIR, 'jobs')
-    os.makedirs(SYSTEM_LOG_DIR, exist_ok=True)
-    os.makedirs(JOB_LOG_DIR, exist_ok=True)
+    system_dir = os.path.join(log_dir, 'system')
+    job_dir = os.path.join(log_dir, 'jobs')
+    os.makedirs(system_dir, exist_ok=True)
+    os.makedirs(job_dir, exist_ok=True)
+    
+    prepared = _LOG_DIRS_READY[configured_dir] = (log_dir, system_dir, job_dir)
+    return prepared
+
+
+# Ensure logs directory exists (project /logs by default, fallback to ./logs if not writable)
+LOG_DIR, SYSTEM_LOG_DIR, JOB_LOG_DIR = _prepare_log_dirs(config.get('LOG_DIR'))
+
+
+# (epoch second, formatted text) of the last rendered log timestamp
+_last_timestamp = (None, '')
+
+
+def _tehran_timestamp(second: Optional[int] = None) -> str:
+    """Render an epoch second (default: now) in Tehran time as "YYYY-MM-DD HH:MM:SS"."""
+    global _last_timestamp
+    if second is None:
+        second = int(time.time())
+    cached_second, text = _last_timestamp
+    if cached_second != second:
+        # Fixed offset, so shifting the epoch and formatting as UTC skips datetime entirely
+        text = time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(second + _TEHRAN_OFFSET_SECONDS))
+        _last_timestamp = (second, text)
+    return text
+
+
+class TehranFormatter(logging.Formatter):
+    """
+    Formatter that renders ``%(asctime)s`` in Tehran time.
+    
+    Without a ``datefmt`` the text is reused for every record within the
+    same second, so bursts of log lines format the time once.
+    """
+    
+    def converter(self, timestamp):
+        return time.gmtime(timestamp + _TEHRAN_OFFSET_SECONDS)
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        return _tehran_timestamp(int(record.created))
+
+
+class BufferedFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that writes through a large userspace buffer.
+    
+    Records below WARNING are written without flushing, so the file sees one
+    ``write()`` per ``buffer_size`` bytes or per explicit ``flush()`` (which
+    BufferedHandler issues after each batch) instead of one per record.
+    WARNING and above are flushed immediately.
+    
+    The file is rotated once it would grow past ``max_bytes``, keeping
+    ``backup_count`` old files. The size is tracked in memory, counting
+    characters, because ``tell()`` on a text stream flushes the write buffer.
+    """
+    
+    def __init__(self, filename: str, mode: str = 'a', encoding: str = 'utf-8',
+                 buffer_size: int = 65536, max_bytes: int = 0, backup_count: int = 0):
+        self.buffer_size = buffer_size
+        self._bytes_written = 0
+        super().__init__(filename, mode, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                      encoding=self.encoding, errors=self.errors)
+        self._bytes_written = os.fstat(stream.fileno()).st_size
+        return stream
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            if 0 < self.maxBytes <= self._bytes_written + len(msg) and self._bytes_written:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._bytes_written += len(msg)
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class BufferedHandler(logging.handlers.MemoryHandler):
+    """
+    Memory handler that batches records for its target and flushes them on a timer.
+    
+    Records are written to the target once the buffer reaches ``capacity``, a record
+    at ``flushLevel`` or above arrives, or ``flush_interval`` seconds pass, whichever
+    comes first. Pending records are flushed when the handler is closed, which
+    ``logging.shutdown`` does at interpreter exit.
+    """
+    
+    def __init__(self, target: logging.Handler, capacity: int = 512,
+                 flush_interval: float = 1.0, flushLevel: int = logging.ERROR):
+        super().__init__(capacity, flushLevel=flushLevel, target=target, flushOnClose=True)
+        self.flush_interval = flush_interval
+        self._stop_event = threading.Event()
+        self._flush_thread = threading.Thread(target=self._flush_periodically, name="log-flush", daemon=True)
+        self._flush_thread.start()
+    
+    def flush(self):
+        """Hand buffered records to the target, then flush the target once for the batch."""
+        super().flush()
+        with self.lock:
+            if self.target is not None:
+                self.target.flush()
+    
+    def _flush_periodically(self):
+        """Flush buffered records every ``flush_interval`` seconds until closed."""
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+    
+    def close(self):
+        """Stop the flush thread, flush pending records and close the target."""
+        self._stop_event.set()
+        target = self.target
+        super().close()
+        if target is not None:
+            target.close()
+
+
+def setup_logging(level: str = 'INFO', log_file: str = None, reload_config: bool = False):
+    """
+    Sets up global logging configuration.
     
-    numeric_level = getattr(logging, level.upper(), None)
-    if not isinstance(numeric_level, int):
+    Pass ``reload_config=True`` to re-read the environment first, e.g. after
+    changing LOG_DIR at runtime; otherwise the already loaded config is used.
+    """
+    # Reinitialize log directories in case LOG_DIR changed
+    global LOG_DIR, SYSTEM_LOG_DIR, JOB_LOG_DIR
+    
+    if reload_config:
+        config.reload()
+    
+    LOG_DIR, SYSTEM_LOG_DIR, JOB_LOG_DIR = _prepare_log_dirs(config.get('LOG_DIR'))
+    
+    numeric_level = _LEVELS.get(level.upper())
+    if numeric_level is None:
         raise ValueError(f'Invalid log level: {level}')
 
     # Configure handlers separately: file at configured level, console at WARNING+
     root_logger = logging.getLogger()
+    for handler in root_logger.handlers:
+        handler.close()
     root_logger.handlers = []
     root_logger.setLevel(numeric_level)
 
     target_file = log_file or os.path.join(SYSTEM_LOG_DIR, 'application.log')
 
-    file_handler = logging.FileHandler(target_file)
+    file_handler = BufferedFileHandler(
+        target_file,
+        max_bytes=config.get('LOG_MAX_BYTES', 0),
+        backup_count=config.get('LOG_BACKUP_COUNT', 0)
+    )
     file_handler.setLevel(numeric_level)
-    file_handler.setFormatter(logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s'))
+    file_handler.setFormatter(TehranFormatter('[%(asctime)s] %(levelname)s: %(message)s'))
 
     stream_handler = logging.StreamHandler()
     stream_handler.setLevel(logging.WARNING)
-    stream_handler.setFormatter(logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s'))
+    stream_handler.setFormatter(TehranFormatter('[%(asctime)s] %(levelname)s: %(message)s'))
 
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(BufferedHandler(file_handler))
     root_logger.addHandler(stream_handler)
 
 
-def log_with_timestamp(message: str, name: str = "Pipeline", level: str = "info", category: str = None):
-    """Log message with Tehran timestamp"""
-    # Tehran is UTC+3:30
-    tehran_tz = timezone(timedelta(hours=3, minutes=30))
-    timestamp = datetime.now(tehran_tz).strftime("%Y-%m-%d %H:%M:%S")
-    prefix = f"{name}"
-    if category:
-        prefix += f"[{category}]"
-    log_message = f"[{timestamp}] {prefix}: {message}"
-
-    if level.lower() == "info":
-        logging.info(log_message)
-    elif level.lower() == "warning":
-        logging.warning(log_message)
-    elif level.lower() == "error":
-        logging.error(log_message)
-    elif level.lower() == "debug":
-        logging.debug(log_message)
-    else:
-        logging.info(log_message) # Default to info
+# Level names accepted by setup_logging and log_with_timestamp (the latter logs
+# anything else at INFO)
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+# Upper-case spellings too, so the usual inputs resolve without calling lower()
+_LEVELS.update({key.upper(): value for key, value in list(_LEVELS.items())})
+
+
+def _resolve_level(level: str) -> int:
+    """Map a level name to its numeric level, defaulting to INFO."""
+    numeric_level = _LEVELS.get(level)
+    if numeric_level is None:
+        numeric_level = _LEVELS.get(level.lower(), logging.INFO)
+    return numeric_level
+
+
+def log_with_timestamp(message: str, name: str = "Pipeline", level: str = "info", *args, category: str = None):
+    """
+    Log message under a component name.
+    
+    The Tehran timestamp is added by the handlers' TehranFormatter, so the
+    time is rendered once per line rather than in both message and format.
+    Nothing is formatted when the root logger would drop the level. Extra positional
+    ``args`` fill %-style placeholders in ``message`` only when a record is emitted,
+    e.g. ``log_with_timestamp("Executed migration: %s", "Migration Manager", "debug", name)``.
+    ``category`` is keyword-only so it can never be taken for one of those args.
+    """
+    numeric_level = _resolve_level(level)
+    if not logging.root.isEnabledFor(numeric_level):
+        return
+    
+    prefix = f"{name}[{category}]" if category else name
+    logging.log(numeric_level, f"{prefix}: {message}", *args)
 
 
 def get_job_log_path(job_name: str) -> str:
@@ -117,10 +287,31 @@ def get_logger(name: str = None) -> logging.Logger:
     return logging.getLogger(name)
 
 
+# Extra attributes added to every record created in the current thread or task
+_log_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar('log_context', default=None)
+_base_record_factory = logging.getLogRecordFactory()
+
+
+def _context_record_factory(*args, **kwargs) -> logging.LogRecord:
+    """Create a log record carrying the attributes of the active LoggingContext, if any."""
+    record = _base_record_factory(*args, **kwargs)
+    context = _log_context.get()
+    if context:
+        record.__dict__.update(context)
+    return record
+
+
+# Installed once; LoggingContext only swaps the context variable
+logging.setLogRecordFactory(_context_record_factory)
+
+
 class LoggingContext:
     """
     Context manager for structured logging with additional context.
     
+    The context lives in a ContextVar, so concurrent threads and asyncio tasks
+    each see only their own context, and nested contexts are merged.
+    
     Example:
         >>> with LoggingContext('DataProcessing', job_id='123', pipeline='my_pipeline'):
         ...     log_with_timestamp('Processing started', 'Pipeline')
@@ -137,36 +328,27 @@ class LoggingContext:
         """
         self.name = name
         self.context = context
-        self.original_factory = None
+        self._token = None
         
     def __enter__(self):
         """Enter the logging context."""
-        # Store original record factory
-        self.original_factory = logging.getLogRecordFactory()
-        
-        # Create new factory that adds context
-        def record_factory(*args, **kwargs):
-            record = self.original_factory(*args, **kwargs)
-            # Add context to the record
-            for key, value in self.context.items():
-                setattr(record, key, value)
-            return record
-        
-        # Set the new factory
-        logging.setLogRecordFactory(record_factory)
+        self._token = _log_context.set({**(_log_context.get() or {}), **self.context})
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Exit the logging context."""
-        # Restore original factory
-        if self.original_factory:
-            logging.setLogRecordFactory(self.original_factory)
+        if self._token is not None:
+            _log_context.reset(self._token)
+            self._token = None
 
 
 def log_function_call(func_name: str = None, level: str = "debug"):
     """
     Decorator for logging function calls with execution time.
     
+    When ``level`` is disabled on the root logger the start and completion
+    messages are skipped entirely; errors are still logged.
+    
     Args:
         func_name: Custom function name for logging. If None, uses actual function name.
         level: Log level for the messages.
@@ -176,32 +358,35 @@ def log_function_call(func_name: str = None, level: str = "debug"):
         ... def my_function(data):
         ...     return process(data)
     """
+    numeric_level = _resolve_level(level)
+    
     def decorator(func):
-        import functools
-        import time
+        name = func_name or func.__name__
         
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            name = func_name or func.__name__
-            start_time = time.time()
+            enabled = logging.root.isEnabledFor(numeric_level)
+            start_time = time.perf_counter()
             
             # Log function start
-            log_with_timestamp(f"Starting {name}", "FunctionCall", level)
+            if enabled:
+                log_with_timestamp(f"Starting {name}", "FunctionCall", level)
             
             try:
                 result = func(*args, **kwargs)
-                execution_time = time.time() - start_time
                 
                 # Log successful completion
-                log_with_timestamp(
-                    f"Completed {name} in {execution_time:.2f}s", 
-                    "FunctionCall", 
-                    level
-                )
+                if enabled:
+                    execution_time = time.perf_counter() - start_time
+                    log_with_timestamp(
+                        f"Completed {name} in {execution_time:.2f}s", 
+                        "FunctionCall", 
+                        level
+                    )
                 return result
                 
             except Exception as e:
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
                 
                 # Log error
                 log_with_timestamp(
@@ -219,6 +404,9 @@ def log_pipeline_stage(stage_name: str, level: str = "info"):
     """
     Decorator for logging pipeline stages (extract, transform, load).
     
+    When ``level`` is disabled on the root logger the start and completion
+    messages are skipped entirely; errors are still logged.
+    
     Args:
         stage_name: Name of the pipeline stage
         level: Log level for the messages
@@ -228,37 +416,43 @@ def log_pipeline_stage(stage_name: str, level: str = "info"):
         ... def extract_data():
         ...     return data
     """
+    numeric_level = _resolve_level(level)
+    
     def decorator(func):
-        import functools
-        import time
-        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
+            enabled = logging.root.isEnabledFor(numeric_level)
+            start_time = time.perf_counter()
             
             # Log stage start
-            log_with_timestamp(f"[{stage_name}] Starting", "Pipeline", level)
+            if enabled:
+                log_with_timestamp(f"[{stage_name}] Starting", "Pipeline", level)
             
             try:
                 result = func(*args, **kwargs)
-                execution_time = time.time() - start_time
-                
-                # Log stage completion with data info
-                data_info = ""
-                if hasattr(result, 'shape'):  # pandas DataFrame
-                    data_info = f" (shape: {result.shape})"
-                elif hasattr(result, '__len__'):  # list, dict, etc.
-                    data_info = f" (length: {len(result)})"
                 
-                log_with_timestamp(
-                    f"[{stage_name}] Completed in {execution_time:.2f}s{data_info}", 
-                    "Pipeline", 
-                    level
-                )
+                if enabled:
+                    execution_time = time.perf_counter() - start_time
+                    
+                    # Log stage completion with data info
+                    # Probe the type rather than the instance, so a miss never
+                    # falls through to pandas' column-resolving __getattr__
+                    data_info = ""
+                    result_type = type(result)
+                    if hasattr(result_type, 'shape'):  # pandas DataFrame
+                        data_info = f" (shape: {result.shape})"
+                    elif hasattr(result_type, '__len__'):  # list, dict, etc.
+                        data_info = f" (length: {len(result)})"
+                    
+                    log_with_timestamp(
+                        f"[{stage_name}] Completed in {execution_time:.2f}s{data_info}", 
+                        "Pipeline", 
+                        level
+                    )
                 return result
                 
             except Exception as e:
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
                 
                 # Log stage error
                 log_with_timestamp(
@@ -299,15 +493,13 @@ class PerformanceLogger:
         
     def __enter__(self):
         """Start timing the operation."""
-        import time
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         log_with_timestamp(f"{self.operation_name} started", self.logger_name, self.level)
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
         """End timing and log the result."""
-        import time
-        execution_time = time.time() - self.start_time
+        execution_time = time.perf_counter() - self.start_time
         
         if exc_type is None:
             # Success
@@ -325,10 +517,61 @@ class PerformanceLogger:
             )
 
 
+# All job loggers enqueue onto one queue, drained by a single listener thread that
+# routes each record to its job's file handler (logger name -> handler)
+_JOB_LOG_QUEUE = queue.Queue(-1)
+_JOB_HANDLERS: Dict[str, logging.Handler] = {}
+# Configured job loggers by job name, so repeat calls skip all setup work
+_JOB_LOGGERS: Dict[str, logging.Logger] = {}
+_job_log_listener: Optional[logging.handlers.QueueListener] = None
+_job_log_lock = threading.Lock()
+
+
+class _JobLogDispatcher(logging.Handler):
+    """Hand each record to the file handler registered for its job logger."""
+    
+    def handle(self, record):
+        """Pass the record to its job's handler if that handler's level allows it."""
+        handler = _JOB_HANDLERS.get(record.name)
+        if handler is not None and record.levelno >= handler.level:
+            handler.handle(record)
+        return True
+    
+    def flush(self):
+        """Flush every job file handler."""
+        for handler in list(_JOB_HANDLERS.values()):
+            handler.flush()
+    
+    def close(self):
+        """Close every job file handler."""
+        for handler in list(_JOB_HANDLERS.values()):
+            handler.close()
+        super().close()
+
+
+def _start_job_log_listener():
+    """Start the shared job log listener on first use."""
+    global _job_log_listener
+    
+    with _job_log_lock:
+        if _job_log_listener is None:
+            # One batching handler and flush thread in front of every job file
+            _job_log_listener = logging.handlers.QueueListener(
+                _JOB_LOG_QUEUE, BufferedHandler(_JobLogDispatcher()), respect_handler_level=True
+            )
+            _job_log_listener.start()
+            # Runs before logging's own shutdown hook, so queued records reach the files
+            atexit.register(_job_log_listener.stop)
+
+
 def create_job_logger(job_name: str) -> logging.Logger:
     """
     Create a dedicated logger for a specific job with its own log file.
     
+    The job's code only enqueues records; the shared listener thread writes them
+    to the job's file, so logging never blocks the caller on disk writes.
+    Loggers are memoized per job name, so repeat calls are a single dict lookup.
+    
     Args:
         job_name: Name of the job
         
@@ -340,27 +583,39 @@ def create_job_logger(job_name: str) -> logging.Logger:
         >>> logger.info('Pipeline started')
         # Logs to logs/jobs/my_pipeline.log
     """
+    logger = _JOB_LOGGERS.get(job_name)
+    if logger is not None:
+        return logger
+    
     logger = logging.getLogger(f"job.{job_name}")
     
     # Avoid adding handlers multiple times
     if logger.handlers:
+        _JOB_LOGGERS[job_name] = logger
         return logger
     
     # Create job-specific file handler
     job_log_path = get_job_log_path(job_name)
-    handler = logging.FileHandler(job_log_path)
+    handler = BufferedFileHandler(
+        job_log_path,
+        max_bytes=config.get('LOG_MAX_BYTES', 0),
+        backup_count=config.get('LOG_BACKUP_COUNT', 0)
+    )
     handler.setLevel(logging.INFO)
     
     # Use detailed format for job logs
-    formatter = logging.Formatter(
+    formatter = TehranFormatter(
         '[%(asctime)s] %(levelname)s - %(name)s - %(message)s'
     )
     handler.setFormatter(formatter)
     
-    logger.addHandler(handler)
+    _JOB_HANDLERS[logger.name] = handler
+    _start_job_log_listener()
+    logger.addHandler(logging.handlers.QueueHandler(_JOB_LOG_QUEUE))
     logger.setLevel(logging.INFO)
     
     # Prevent propagation to root logger to avoid duplicate logs
     logger.propagate = False
     
-    return logger
\ No newline at end of file
+    _JOB_LOGGERS[job_name] = logger
+    return logger
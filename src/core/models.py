@@ -6,15 +6,51 @@ This module provides Pydantic models for configuration, pipeline data,
 and other framework components to ensure type safety and data validation.
 """
 
-from typing import Dict, Any, List, Optional, Union, Literal
-from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Annotated, Dict, Any, List, Optional, Union, Literal
+from datetime import datetime, timezone
 from pathlib import Path
-import os
+import re
 
-from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
-from pydantic_settings import BaseSettings
+from pydantic import AfterValidator, BaseModel, Field, field_validator, ConfigDict, TypeAdapter, ValidationError
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from .constants import TIME_SCOPES, LOG_LEVELS, STATUS_CODES
+from .constants import TIME_SCOPES, LOG_LEVELS, STATUS_CODES, CLICKHOUSE_COMPRESSION_CODECS
+
+def _utc_now() -> datetime:
+    """Current time as a timezone-aware UTC datetime (default for timestamp fields)."""
+    return datetime.now(timezone.utc)
+
+
+# Hashed copies of the allowed values for membership checks in validators
+_LOG_LEVELS = frozenset(LOG_LEVELS)
+_TIME_SCOPES = frozenset(TIME_SCOPES)
+_CLICKHOUSE_COMPRESSION_CODECS = frozenset(CLICKHOUSE_COMPRESSION_CODECS)
+
+
+def _check_http_scheme(v: str) -> str:
+    """Reject non-empty URLs that do not use the http or https scheme."""
+    if v and not v.startswith(('http://', 'https://')):
+        raise ValueError("URL must start with http:// or https://")
+    return v
+
+
+# URL strings checked by a plain function attached to the field type, rather
+# than a classmethod validator dispatched per model
+HttpUrlStr = Annotated[str, AfterValidator(_check_http_scheme)]
+
+# Five whitespace-separated cron fields (minute hour day month day_of_week)
+_CRON_RE = re.compile(r'\s*\S+(?:\s+\S+){4}\s*')
+
+
+def _check_cron_schedule(v: str) -> str:
+    """Reject cron expressions that do not have exactly five fields."""
+    if not _CRON_RE.fullmatch(v):
+        raise ValueError("Cron schedule must have 5 parts (minute hour day month day_of_week)")
+    return v
+
+
+CronSchedule = Annotated[str, AfterValidator(_check_cron_schedule)]
 
 
 class FrameworkSettings(BaseSettings):
@@ -26,15 +62,20 @@ class FrameworkSettings(BaseSettings):
     
     # Logging configuration
     log_level: str = Field(default='INFO', description="Logging level")
+    # Created by core.logging when logging is set up, not on validation
     log_dir: str = Field(default='logs', description="Directory for log files")
     log_file: Optional[str] = Field(default=None, description="Main log file path")
+    log_max_bytes: int = Field(default=50 * 1024 * 1024, ge=0, description="Size at which log files are rotated (0 disables rotation)")
+    log_backup_count: int = Field(default=5, ge=0, description="Number of rotated log files to keep")
     
     # Application configuration
     timeout: int = Field(default=30, ge=1, le=300, description="Request timeout in seconds")
-    batch_size: int = Field(default=1000, ge=1, description="Batch size for processing")
+    batch_size: int = Field(default=10000, ge=1, description="Batch size for processing")
     max_retries: int = Field(default=3, ge=0, le=10, description="Maximum retry attempts")
     retry_delay: float = Field(default=1.0, ge=0.1, description="Delay between retries")
     retry_backoff: float = Field(default=2.0, ge=1.0, description="Retry backoff multiplier")
+    backfill_concurrency: int = Field(default=4, ge=1, description="Maximum jobs backfilled concurrently")
+    http_rate_limit: float = Field(default=10.0, ge=0, description="Maximum HTTP requests per second per host (0 disables)")
     
     # ClickHouse configuration
     clickhouse_host: str = Field(default='localhost', description="ClickHouse host")
@@ -43,13 +84,15 @@ class FrameworkSettings(BaseSettings):
     clickhouse_password: str = Field(default='', description="ClickHouse password")
     clickhouse_database: str = Field(default='data_warehouse', description="ClickHouse database")
     clickhouse_timeout: int = Field(default=30, ge=1, description="ClickHouse connection timeout")
+    clickhouse_compression: str = Field(default='lz4', description="ClickHouse wire compression (lz4, zstd, gzip or none)")
+    clickhouse_pool_size: int = Field(default=16, ge=1, description="ClickHouse HTTP connections kept open per host")
     
     # Generic API configuration
     api_key: Optional[str] = Field(default=None, description="Generic API key")
-    api_base_url: Optional[str] = Field(default=None, description="Generic API base URL")
+    api_base_url: Optional[HttpUrlStr] = Field(default=None, description="Generic API base URL")
     
     # Metabase configuration
-    metabase_base_url: Optional[str] = Field(default=None, description="Metabase base URL")
+    metabase_base_url: Optional[HttpUrlStr] = Field(default=None, description="Metabase base URL")
     metabase_api_key: Optional[str] = Field(default=None, description="Metabase API key")
     metabase_timeout: int = Field(default=30, ge=1, description="Metabase request timeout")
     
@@ -57,36 +100,22 @@ class FrameworkSettings(BaseSettings):
     @classmethod
     def validate_log_level(cls, v):
         """Validate log level is supported."""
-        if v.upper() not in LOG_LEVELS:
+        if v.upper() not in _LOG_LEVELS:
             raise ValueError(f"Log level must be one of: {LOG_LEVELS}")
         return v.upper()
     
-    @field_validator('log_dir')
+    @field_validator('clickhouse_compression')
     @classmethod
-    def validate_log_dir(cls, v):
-        """Ensure log directory exists."""
-        if v:
-            os.makedirs(v, exist_ok=True)
-        return v
-    
-    @field_validator('api_base_url')
-    @classmethod
-    def validate_api_base_url(cls, v):
-        """Validate API base URL format."""
-        if v and not v.startswith(('http://', 'https://')):
-            raise ValueError("API base URL must start with http:// or https://")
-        return v
-    
-    @field_validator('metabase_base_url')
-    @classmethod
-    def validate_metabase_base_url(cls, v):
-        """Validate Metabase base URL format."""
-        if v and not v.startswith(('http://', 'https://')):
-            raise ValueError("Metabase base URL must start with http:// or https://")
-        return v
-    
-    model_config = ConfigDict(
-        env_file='.env',
+    def validate_clickhouse_compression(cls, v):
+        """Validate ClickHouse compression codec is supported."""
+        if v.lower() not in _CLICKHOUSE_COMPRESSION_CODECS:
+            raise ValueError(f"ClickHouse compression must be one of: {CLICKHOUSE_COMPRESSION_CODECS}")
+        return v.lower()
+    
+    model_config = SettingsConfigDict(
+        # No env_file: core.config loads .env into the process environment once,
+        # so constructing settings never re-reads and re-parses the file
+        env_file=None,
         case_sensitive=False,
         # Environment variable mapping is handled automatically by field names
     )
@@ -97,28 +126,21 @@ class PipelineConfig(BaseModel):
     
     name: str = Field(..., min_length=1, description="Pipeline name")
     description: Optional[str] = Field(default=None, description="Pipeline description")
-    schedule: str = Field(default="0 * * * *", description="Cron schedule expression")
+    schedule: CronSchedule = Field(default="0 * * * *", description="Cron schedule expression")
     enabled: bool = Field(default=True, description="Whether pipeline is enabled")
     timeout: Optional[int] = Field(default=None, ge=1, description="Pipeline timeout in seconds")
     retry_count: int = Field(default=3, ge=0, description="Number of retries on failure")
     time_scope: Optional[str] = Field(default=None, description="Time scope for data processing")
     
-    @field_validator('schedule')
-    @classmethod
-    def validate_cron_schedule(cls, v):
-        """Validate cron schedule format."""
-        parts = v.strip().split()
-        if len(parts) != 5:
-            raise ValueError("Cron schedule must have 5 parts (minute hour day month day_of_week)")
-        return v
-    
     @field_validator('time_scope')
     @classmethod
     def validate_time_scope(cls, v):
         """Validate time scope is supported."""
-        if v and v not in TIME_SCOPES:
+        if v and v not in _TIME_SCOPES:
             raise ValueError(f"Time scope must be one of: {TIME_SCOPES}")
         return v
+    
+    model_config = ConfigDict(defer_build=True, frozen=True)
 
 
 class PipelineData(BaseModel):
@@ -126,52 +148,52 @@ class PipelineData(BaseModel):
     
     pipeline: Any = Field(..., description="Pipeline function or callable")
     config: PipelineConfig = Field(..., description="Pipeline configuration")
-    created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp")
-    updated_at: datetime = Field(default_factory=datetime.utcnow, description="Last update timestamp")
+    created_at: datetime = Field(default_factory=_utc_now, description="Creation timestamp")
+    updated_at: datetime = Field(default_factory=_utc_now, description="Last update timestamp")
     
-    model_config = ConfigDict(arbitrary_types_allowed=True)  # Allow callable types
+    model_config = ConfigDict(arbitrary_types_allowed=True, defer_build=True)  # Allow callable types
 
 
-class ExtractorConfig(BaseModel):
-    """Configuration model for data extractors."""
+class _ExtractorFields(BaseModel):
+    """Fields shared by the per-type extractor models."""
     
     type: Literal['http', 'clickhouse', 'file'] = Field(..., description="Extractor type")
-    url: Optional[str] = Field(default=None, description="URL for HTTP extractor")
+    url: Optional[HttpUrlStr] = Field(default=None, description="URL for HTTP extractor")
     headers: Optional[Dict[str, str]] = Field(default=None, description="HTTP headers")
     query: Optional[str] = Field(default=None, description="SQL query for database extractor")
     file_path: Optional[str] = Field(default=None, description="File path for file extractor")
     timeout: Optional[int] = Field(default=30, ge=1, description="Request timeout")
     
-    @field_validator('url')
-    @classmethod
-    def validate_url(cls, v):
-        """Validate URL for HTTP extractors."""
-        if v and not v.startswith(('http://', 'https://')):
-            raise ValueError("URL must start with http:// or https://")
-        return v
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
+
+class HTTPExtractorConfig(_ExtractorFields):
+    """HTTP extractor configuration; the URL is required."""
     
-    @field_validator('query')
-    @classmethod
-    def validate_query(cls, v):
-        """Validate query for database extractors."""
-        return v
+    type: Literal['http'] = Field(..., description="Extractor type")
+    url: HttpUrlStr = Field(..., min_length=1, description="URL for HTTP extractor")
+
+
+class ClickHouseExtractorConfig(_ExtractorFields):
+    """ClickHouse extractor configuration; the query is required."""
     
-    @field_validator('file_path')
-    @classmethod
-    def validate_file_path(cls, v):
-        """Validate file path for file extractors."""
-        return v
+    type: Literal['clickhouse'] = Field(..., description="Extractor type")
+    query: str = Field(..., min_length=1, description="SQL query for database extractor")
+
+
+class FileExtractorConfig(_ExtractorFields):
+    """File extractor configuration; the file path is required."""
     
-    @model_validator(mode='after')
-    def validate_extractor_requirements(self):
-        """Validate extractor-specific requirements."""
-        if self.type == 'http' and not self.url:
-            raise ValueError("URL is required for HTTP extractor")
-        if self.type == 'clickhouse' and not self.query:
-            raise ValueError("Query is required for ClickHouse extractor")
-        if self.type == 'file' and not self.file_path:
-            raise ValueError("File path is required for file extractor")
-        return self
+    type: Literal['file'] = Field(..., description="Extractor type")
+    file_path: str = Field(..., min_length=1, description="File path for file extractor")
+
+
+# Configuration for data extractors, dispatched on ``type``: pydantic-core selects
+# the one matching model, whose required fields enforce the per-type requirements
+ExtractorConfig = Annotated[
+    Union[HTTPExtractorConfig, ClickHouseExtractorConfig, FileExtractorConfig],
+    Field(discriminator='type')
+]
 
 
 class TransformerConfig(BaseModel):
@@ -182,11 +204,11 @@ class TransformerConfig(BaseModel):
     operations: Optional[List[str]] = Field(default=None, description="List of operations")
     parameters: Optional[Dict[str, Any]] = Field(default=None, description="Transform parameters")
     
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    model_config = ConfigDict(arbitrary_types_allowed=True, defer_build=True)
 
 
-class LoaderConfig(BaseModel):
-    """Configuration model for data loaders."""
+class _LoaderFields(BaseModel):
+    """Fields shared by the per-type loader models."""
     
     type: Literal['clickhouse', 'console', 'file'] = Field(..., description="Loader type")
     table: Optional[str] = Field(default=None, description="Table name for database loader")
@@ -195,18 +217,33 @@ class LoaderConfig(BaseModel):
     mode: Optional[str] = Field(default='insert', description="Loading mode (insert, upsert)")
     batch_size: Optional[int] = Field(default=1000, ge=1, description="Batch size")
     
-    @field_validator('table')
-    @classmethod
-    def validate_table(cls, v):
-        """Validate table for database loaders."""
-        return v
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
+
+class ClickHouseLoaderConfig(_LoaderFields):
+    """ClickHouse loader configuration; the table name is required."""
     
-    @model_validator(mode='after')
-    def validate_loader_requirements(self):
-        """Validate loader-specific requirements."""
-        if self.type == 'clickhouse' and not self.table:
-            raise ValueError("Table name is required for ClickHouse loader")
-        return self
+    type: Literal['clickhouse'] = Field(..., description="Loader type")
+    table: str = Field(..., min_length=1, description="Table name for database loader")
+
+
+class ConsoleLoaderConfig(_LoaderFields):
+    """Console loader configuration."""
+    
+    type: Literal['console'] = Field(..., description="Loader type")
+
+
+class FileLoaderConfig(_LoaderFields):
+    """File loader configuration."""
+    
+    type: Literal['file'] = Field(..., description="Loader type")
+
+
+# Configuration for data loaders, dispatched on ``type`` (see ExtractorConfig)
+LoaderConfig = Annotated[
+    Union[ClickHouseLoaderConfig, ConsoleLoaderConfig, FileLoaderConfig],
+    Field(discriminator='type')
+]
 
 
 class JobExecution(BaseModel):
@@ -214,21 +251,14 @@ class JobExecution(BaseModel):
     
     job_name: str = Field(..., description="Job name")
     pipeline_name: str = Field(..., description="Pipeline name")
-    started_at: datetime = Field(default_factory=datetime.utcnow, description="Start time")
+    started_at: datetime = Field(default_factory=_utc_now, description="Start time")
     completed_at: Optional[datetime] = Field(default=None, description="Completion time")
-    status: str = Field(default='running', description="Execution status")
+    status: Literal['running', 'completed', 'failed', 'cancelled'] = Field(default='running', description="Execution status")
     records_processed: Optional[int] = Field(default=None, ge=0, description="Number of records processed")
     error_message: Optional[str] = Field(default=None, description="Error message if failed")
     execution_time: Optional[float] = Field(default=None, ge=0, description="Execution time in seconds")
     
-    @field_validator('status')
-    @classmethod
-    def validate_status(cls, v):
-        """Validate execution status."""
-        valid_statuses = ['running', 'completed', 'failed', 'cancelled']
-        if v not in valid_statuses:
-            raise ValueError(f"Status must be one of: {valid_statuses}")
-        return v
+    model_config = ConfigDict(defer_build=True)
 
 
 class DatabaseConfig(BaseModel):
@@ -241,34 +271,43 @@ class DatabaseConfig(BaseModel):
     database: str = Field(..., description="Database name")
     timeout: int = Field(default=30, ge=1, description="Connection timeout")
     
-    model_config = ConfigDict()
+    model_config = ConfigDict(defer_build=True, frozen=True)
 
 
 class APIConfig(BaseModel):
     """API configuration model."""
     
-    base_url: str = Field(..., description="API base URL")
+    # Trailing slash is removed
+    base_url: Annotated[HttpUrlStr, AfterValidator(lambda v: v.rstrip('/'))] = Field(
+        ..., min_length=1, description="API base URL"
+    )
     api_key: Optional[str] = Field(default=None, description="API key")
     timeout: int = Field(default=30, ge=1, description="Request timeout")
     max_retries: int = Field(default=3, ge=0, description="Maximum retries")
     headers: Optional[Dict[str, str]] = Field(default=None, description="Default headers")
     
-    @field_validator('base_url')
-    @classmethod
-    def validate_base_url(cls, v):
-        """Validate base URL format."""
-        if not v.startswith(('http://', 'https://')):
-            raise ValueError("Base URL must start with http:// or https://")
-        return v.rstrip('/')  # Remove trailing slash
+    model_config = ConfigDict(defer_build=True, frozen=True)
 
 
-class ValidationResult(BaseModel):
-    """Result of validation operations."""
+@dataclass(slots=True)
+class ValidationResult:
+    """
+    Result of validation operations.
+    
+    A plain dataclass rather than a Pydantic model: it is only ever built by the
+    framework, so constructing it and appending messages need no validation.
+    
+    Attributes:
+        is_valid: Whether validation passed
+        errors: List of validation errors
+        warnings: List of validation warnings
+        data: Validated data
+    """
     
-    is_valid: bool = Field(..., description="Whether validation passed")
-    errors: List[str] = Field(default_factory=list, description="List of validation errors")
-    warnings: List[str] = Field(default_factory=list, description="List of validation warnings")
-    data: Optional[Dict[str, Any]] = Field(default=None, description="Validated data")
+    is_valid: bool
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    data: Optional[Dict[str, Any]] = None
     
     def add_error(self, message: str) -> None:
         """Add an error message."""
@@ -290,6 +329,23 @@ class ValidationResult(BaseModel):
         return len(self.warnings) > 0
 
 
+# pandas.DataFrame, resolved on first use: core.config imports this module, and
+# importing core should not pull in pandas
+_DataFrame = None
+
+
+def _pandas_dataframe_type() -> type:
+    """Return pandas.DataFrame, importing pandas only on the first call."""
+    global _DataFrame
+    if _DataFrame is None:
+        try:
+            from pandas import DataFrame
+        except ImportError:
+            raise ValueError("pandas is required to create DataFrameInfo")
+        _DataFrame = DataFrame
+    return _DataFrame
+
+
 class DataFrameInfo(BaseModel):
     """Information about a pandas DataFrame."""
     
@@ -303,22 +359,22 @@ class DataFrameInfo(BaseModel):
     @classmethod
     def from_dataframe(cls, df):
         """Create DataFrameInfo from pandas DataFrame."""
-        try:
-            import pandas as pd
-            
-            if not isinstance(df, pd.DataFrame):
-                raise ValueError("Input must be a pandas DataFrame")
-            
-            return cls(
-                shape=df.shape,
-                columns=list(df.columns),
-                dtypes={col: str(dtype) for col, dtype in df.dtypes.items()},
-                memory_usage=df.memory_usage(deep=True).sum(),
-                has_nulls=df.isnull().any().any(),
-                null_counts=df.isnull().sum().to_dict()
-            )
-        except ImportError:
-            raise ValueError("pandas is required to create DataFrameInfo")
+        data_frame_type = _pandas_dataframe_type()
+        if not isinstance(df, data_frame_type):
+            raise ValueError("Input must be a pandas DataFrame")
+        
+        # One null scan serves both the per-column counts and has_nulls
+        null_counts = df.isnull().sum()
+        return cls(
+            shape=df.shape,
+            columns=list(df.columns),
+            dtypes=df.dtypes.astype(str).to_dict(),
+            memory_usage=int(df.memory_usage(deep=True).sum()),
+            has_nulls=bool(null_counts.any()),
+            null_counts=null_counts.to_dict()
+        )
+    
+    model_config = ConfigDict(defer_build=True)
 
 
 # Model registry for dynamic model creation
@@ -337,7 +393,7 @@ MODEL_REGISTRY = {
 }
 
 
-def get_model(model_name: str) -> BaseModel:
+def get_model(model_name: str) -> Any:
     """
     Get a Pydantic model by name.
     
@@ -345,37 +401,85 @@ def get_model(model_name: str) -> BaseModel:
         model_name: Name of the model
         
     Returns:
-        Pydantic model class
+        Pydantic model class, or a discriminated union such as ExtractorConfig
+        
+    Raises:
+        ValueError: If model name is not found
+    """
+    model_class = MODEL_REGISTRY.get(model_name)
+    if model_class is None:
+        raise ValueError(f"Unknown model: {model_name}. Available models: {list(MODEL_REGISTRY)}")
+    return model_class
+
+
+# TypeAdapters for registry models, built on first use and reused afterwards
+_ADAPTERS: Dict[str, TypeAdapter] = {}
+
+
+def _registry_adapter(model_name: str) -> Optional[TypeAdapter]:
+    """
+    Get the cached TypeAdapter for a registry model.
+    
+    Args:
+        model_name: Name of the model
+        
+    Returns:
+        TypeAdapter for the model, or None for settings models, which must be
+        constructed so environment values are merged in
         
     Raises:
         ValueError: If model name is not found
     """
-    if model_name not in MODEL_REGISTRY:
-        raise ValueError(f"Unknown model: {model_name}. Available models: {list(MODEL_REGISTRY.keys())}")
-    return MODEL_REGISTRY[model_name]
+    adapter = _ADAPTERS.get(model_name)
+    if adapter is None:
+        model_class = get_model(model_name)
+        if isinstance(model_class, type) and issubclass(model_class, BaseSettings):
+            return None
+        adapter = _ADAPTERS[model_name] = TypeAdapter(model_class)
+    return adapter
 
 
-def validate_data(data: Dict[str, Any], model_name: str) -> ValidationResult:
+def validate_data(data: Dict[str, Any], model_name: str, strict: bool = False) -> ValidationResult:
     """
     Validate data using a Pydantic model.
     
+    Plain models and config unions are validated and dumped through a cached
+    TypeAdapter, which calls the prebuilt validator directly instead of going
+    through ``__init__``.
+    Errors are reported as ``"field: message"`` strings.
+    
+    In strict mode values that would need type coercion are rejected. Settings
+    models read string values from the environment, so they cannot be
+    validated strictly.
+    
     Args:
         data: Data to validate
         model_name: Name of the model to use for validation
+        strict: Reject values that would need coercion
         
     Returns:
         ValidationResult with validation details
     """
     try:
-        model_class = get_model(model_name)
-        validated_data = model_class(**data)
+        adapter = _registry_adapter(model_name)
+        if adapter is None:
+            if strict:
+                raise ValueError(f"Strict validation is not supported for settings model: {model_name}")
+            validated_data = get_model(model_name)(**data).model_dump()
+        else:
+            validated_data = adapter.dump_python(adapter.validate_python(data, strict=strict))
         
         return ValidationResult(
             is_valid=True,
-            data=validated_data.model_dump()
-        )
-    except Exception as e:
-        return ValidationResult(
-            is_valid=False,
-            errors=[str(e)]
+            data=validated_data
         )
+    except ValidationError as e:
+        # One "loc: msg" line per error, without pydantic's full report formatting
+        errors = [
+            f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err['loc'] else err['msg']
+            for err in e.errors(include_url=False, include_context=False, include_input=False)
+        ]
+        return ValidationResult(is_valid=False, errors=errors)
+    except ValueError as e:
+        # Unknown model name, or strict validation of a settings model
+        return ValidationResult(is_valid=False, errors=[str(e)])
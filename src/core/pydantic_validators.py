@@ -16,13 +16,13 @@ from .models import (
     FrameworkSettings, PipelineConfig, PipelineData,
     ExtractorConfig, TransformerConfig, LoaderConfig,
     JobExecution, DatabaseConfig, APIConfig,
-    ValidationResult, DataFrameInfo, get_model, validate_data
+    ValidationResult, DataFrameInfo, MODEL_REGISTRY, get_model, validate_data,
+    _registry_adapter
 )
 from .exceptions import ValidationError
 
 T = TypeVar('T', bound=BaseModel)
 
-
 class PydanticValidator:
     """
     Pydantic-based validator for framework components.
@@ -80,17 +80,20 @@ class PydanticValidator:
         """
         Validate extractor configuration.
         
+        The ``type`` key selects the model directly (see ``ExtractorConfig``), so
+        only that type's schema runs and its required fields are enforced there.
+        
         Args:
             extractor_data: Extractor configuration dictionary
             
         Returns:
-            Validated ExtractorConfig instance
+            Validated HTTPExtractorConfig, ClickHouseExtractorConfig or FileExtractorConfig
             
         Raises:
             ValidationError: If validation fails
         """
         try:
-            return ExtractorConfig(**extractor_data)
+            return _registry_adapter('extractor_config').validate_python(extractor_data)
         except PydanticValidationError as e:
             raise ValidationError(
                 f"Extractor configuration validation failed: {e}",
@@ -124,17 +127,19 @@ class PydanticValidator:
         """
         Validate loader configuration.
         
+        The ``type`` key selects the model directly (see ``LoaderConfig``).
+        
         Args:
             loader_data: Loader configuration dictionary
             
         Returns:
-            Validated LoaderConfig instance
+            Validated ClickHouseLoaderConfig, ConsoleLoaderConfig or FileLoaderConfig
             
         Raises:
             ValidationError: If validation fails
         """
         try:
-            return LoaderConfig(**loader_data)
+            return _registry_adapter('loader_config').validate_python(loader_data)
         except PydanticValidationError as e:
             raise ValidationError(
                 f"Loader configuration validation failed: {e}",
@@ -297,26 +302,35 @@ class PydanticValidator:
         """
         try:
             model_class = get_model(model_name)
-            return PydanticValidator.validate_with_model(data, model_class)
+            if isinstance(model_class, type):
+                return PydanticValidator.validate_with_model(data, model_class)
+            # Discriminated config unions have no constructor to call
+            return _registry_adapter(model_name).validate_python(data)
+        except PydanticValidationError as e:
+            raise ValidationError(
+                f"Validation failed for {model_name}: {e}",
+                {'errors': e.errors(), 'data': data, 'model': model_name}
+            )
         except ValueError as e:
             raise ValidationError(
                 f"Model validation failed: {e}",
-                {'model_name': model_name, 'available_models': list(get_model.__globals__['MODEL_REGISTRY'].keys())}
+                {'model_name': model_name, 'available_models': list(MODEL_REGISTRY)}
             )
     
     @staticmethod
-    def safe_validate(data: Dict[str, Any], model_name: str) -> ValidationResult:
+    def safe_validate(data: Dict[str, Any], model_name: str, strict: bool = False) -> ValidationResult:
         """
         Safely validate data and return detailed results.
         
         Args:
             data: Data to validate
             model_name: Name of the model to use
+            strict: Reject values that would need coercion
             
         Returns:
             ValidationResult with validation details
         """
-        return validate_data(data, model_name)
+        return validate_data(data, model_name, strict)
     
     @staticmethod
     def validate_file_path(file_path: Union[str, Path], must_exist: bool = True, 
@@ -451,6 +465,6 @@ def validate_job_execution(job_data: Dict[str, Any]) -> JobExecution:
     return PydanticValidator.validate_job_execution(job_data)
 
 
-def safe_validate(data: Dict[str, Any], model_name: str) -> ValidationResult:
+def safe_validate(data: Dict[str, Any], model_name: str, strict: bool = False) -> ValidationResult:
     """Safely validate data and return results."""
-    return PydanticValidator.safe_validate(data, model_name)
+    return PydanticValidator.safe_validate(data, model_name, strict)
@@ -16,6 +16,10 @@ import pandas as pd
 from .constants import TIME_SCOPES, LOG_LEVELS, ENV_VARS
 from .exceptions import ValidationError
 
+# Hashed copies of the allowed values for membership checks
+_LOG_LEVELS = frozenset(LOG_LEVELS)
+_TIME_SCOPES = frozenset(TIME_SCOPES)
+
 
 def validate_config(config: Dict[str, Any], required_keys: List[str]) -> None:
     """
@@ -56,7 +60,7 @@ def validate_log_level(level: str) -> None:
     Raises:
         ValidationError: If log level is invalid
     """
-    if level.upper() not in LOG_LEVELS:
+    if level.upper() not in _LOG_LEVELS:
         raise ValidationError(
             f"Invalid log level: {level}. Must be one of: {LOG_LEVELS}",
             {'provided_level': level, 'valid_levels': LOG_LEVELS}
@@ -73,7 +77,7 @@ def validate_time_scope(scope: str) -> None:
     Raises:
         ValidationError: If time scope is invalid
     """
-    if scope not in TIME_SCOPES:
+    if scope not in _TIME_SCOPES:
         raise ValidationError(
             f"Invalid time scope: {scope}. Must be one of: {TIME_SCOPES}",
             {'provided_scope': scope, 'valid_scopes': TIME_SCOPES}
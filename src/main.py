@@ -27,12 +27,40 @@ from migration_manager import ClickHouseMigrationManager
 # Global cron registry
 _cron_registry = {}
 
+# Set once migrations have been applied in this process
+_schema_ready = False
+
+def install_event_loop_policy() -> bool:
+    """
+    Use uvloop for the event loops created by asyncio.run, when it is installed.
+    
+    Returns:
+        True if uvloop was installed, False if the default loop is kept
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
 def ensure_database_schema():
-    """Ensure database schema is up to date by running migrations."""
+    """
+    Ensure database schema is up to date by running migrations.
+    
+    Migrations only run until they first succeed in this process; later calls
+    return True without touching the database.
+    """
+    global _schema_ready
+    
+    if _schema_ready:
+        return True
+    
     log_with_timestamp("Checking database schema...", "Main")
     try:
         migration_manager = ClickHouseMigrationManager()
         if migration_manager.run_migrations():
+            _schema_ready = True
             log_with_timestamp("Database schema is up to date", "Main")
             return True
         else:
@@ -108,7 +136,7 @@ def run_cron_job(job_name: str, *args, **kwargs) -> bool:
         log_with_timestamp(f"Cron job '{job_name}' not found", "Main", "error")
         return False
     
-    # Always ensure database schema is up to date before running any job
+    # Ensure database schema is up to date before running any job (checked once per process)
     if not ensure_database_schema():
         log_with_timestamp(f"Database schema check failed, skipping job: {job_name}", "Main", "error")
         return False
@@ -302,6 +330,7 @@ def main():
     """Main application entry point."""
     # Setup logging
     setup_logging(config.log_level, config.log_file)
+    install_event_loop_policy()
     
     log_with_timestamp("Starting Data Processing Framework", "Main")
     
@@ -15,6 +15,7 @@ from typing import Dict, Any, List, Optional, Callable
 from core.logging import log_with_timestamp
 from pipelines.tools.backfill_utils import backfill_manager, run_backfill
 from pipelines.tools.data_utils import add_merge_metadata
+from pipelines.tools.extractors.http_session import close_http_session
 
 
 class BasePipeline(ABC):
@@ -112,6 +113,8 @@ class BasePipeline(ABC):
             import traceback
             log_with_timestamp(f"Pipeline traceback: {traceback.format_exc()}", "Pipeline", "error")
             return False
+        finally:
+            await close_http_session()
     
     def run_backfill(self, days: int) -> bool:
         """
@@ -14,6 +14,7 @@ Key features:
 - All datetime fields stored as Unix timestamps (UInt32)
 """
 
+import asyncio
 import pandas as pd
 from datetime import datetime
 from typing import Dict, Any, List
@@ -33,6 +34,8 @@ ALLOCATION_DATABASE_ID = 10  # allocation database ID
 CUSTOMER_DATABASE_ID = 15    # customer database ID
 TARGET_TABLE = "financial_trades_latest"
 UNIQUE_KEY_COLUMNS = ["trade_uuid"]  # Only trade_uuid as primary key
+CUSTOMER_UUID_CHUNK_SIZE = 500  # customer UUIDs per IN-list query
+CUSTOMER_QUERY_CONCURRENCY = 5  # customer queries in flight at once
 
 
 class FinancialTradesPipeline(MetabasePipeline, ClickHousePipeline):
@@ -54,12 +57,14 @@ class FinancialTradesPipeline(MetabasePipeline, ClickHousePipeline):
         self.trades_extractor = create_metabase_paginated_extractor(ALLOCATION_DATABASE_ID)
         self.customers_extractor = create_metabase_paginated_extractor(CUSTOMER_DATABASE_ID)
         
-        # Initialize loader
+        # Initialize loader; the table is a ReplacingMergeTree versioned by
+        # updated_at_trade, so newer rows supersede older ones without a DELETE
         self.loader = create_clickhouse_replace_loader(
             table_name=TARGET_TABLE,
             key_columns=UNIQUE_KEY_COLUMNS,
             sort_column='updated_at_trade',
-            name="Financial Trades Loader"
+            name="Financial Trades Loader",
+            delete_existing=False
         )
     
     async def extract(self) -> pd.DataFrame:
@@ -163,10 +168,10 @@ class FinancialTradesPipeline(MetabasePipeline, ClickHousePipeline):
 
         log_with_timestamp(f"Loading {len(data)} records to ClickHouse", "ClickHouse Loader")
         
-        # Get all unique trade_uuids from the current batch
-        trade_uuids = data['trade_uuid'].dropna().unique().tolist()
+        # Rows without a trade_uuid cannot be keyed, so drop them before any other work
+        data = data.dropna(subset=UNIQUE_KEY_COLUMNS)
         
-        if not trade_uuids:
+        if data.empty:
             log_with_timestamp("No valid trade_uuids found in data", "ClickHouse Loader", "warning")
             return False
         
@@ -184,13 +189,41 @@ class FinancialTradesPipeline(MetabasePipeline, ClickHousePipeline):
         return result
     
     async def _extract_customers_data(self, customer_uuids: List[str]) -> pd.DataFrame:
-        """Extract customer data for specific UUIDs from customer.customers table."""
+        """
+        Extract customer data for specific UUIDs from customer.customers table.
+        
+        UUIDs are queried in chunks of CUSTOMER_UUID_CHUNK_SIZE, with up to
+        CUSTOMER_QUERY_CONCURRENCY chunks in flight, so large backfills do not
+        send one oversized IN list and a failed chunk only loses its own rows.
+        """
         if not customer_uuids:
             log_with_timestamp("No customer UUIDs provided", "Customer Extractor", "warning")
             return pd.DataFrame()
         
-        # Create UUID list for SQL IN clause
-        uuid_list = "', '".join(customer_uuids)
+        chunks = [
+            customer_uuids[i:i + CUSTOMER_UUID_CHUNK_SIZE]
+            for i in range(0, len(customer_uuids), CUSTOMER_UUID_CHUNK_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(CUSTOMER_QUERY_CONCURRENCY)
+        
+        async def _extract_chunk(chunk: List[str]) -> pd.DataFrame:
+            async with semaphore:
+                return await self._extract_customers_chunk(chunk)
+        
+        frames = await asyncio.gather(*(_extract_chunk(chunk) for chunk in chunks))
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        
+        data = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        
+        # Filter out records with null customer_uuid
+        return data.dropna(subset=['customer_uuid'])
+    
+    async def _extract_customers_chunk(self, customer_uuids: List[str]) -> pd.DataFrame:
+        """Extract customer data for one chunk of UUIDs."""
+        # Create UUID list for SQL IN clause (Metabase native queries take no bind parameters)
+        uuid_list = "', '".join(uuid.replace("'", "''") for uuid in customer_uuids)
         
         query = f"""
         SELECT 
@@ -232,13 +265,7 @@ class FinancialTradesPipeline(MetabasePipeline, ClickHousePipeline):
         """
         
         # Extract data with pagination
-        data = await self.customers_extractor.extract_from_query(query, "Customers Extractor")
-        
-        # Filter out records with null customer_uuid
-        if not data.empty:
-            data = data.dropna(subset=['customer_uuid'])
-        
-        return data
+        return await self.customers_extractor.extract_from_query(query, "Customers Extractor")
     
     def _prepare_trades_data(self, trades_data: pd.DataFrame) -> pd.DataFrame:
         """Prepare trades data for merging with timestamp conversion."""
@@ -7,17 +7,20 @@ time range management and backfill execution for all pipelines.
 """
 
 import asyncio
+import threading
 from datetime import datetime, timedelta
 from typing import Optional, Callable, Any
 from core.logging import log_with_timestamp
 
 
-class BackfillManager:
+class BackfillManager(threading.local):
     """
     Centralized backfill manager for all pipelines.
     
     This class manages time ranges and backfill state across all pipelines,
     ensuring consistent behavior and avoiding duplicate implementations.
+    State is kept per thread so that jobs backfilled concurrently in worker
+    threads do not overwrite each other's time ranges.
     """
     
     def __init__(self):
@@ -6,11 +6,13 @@ This module provides a generic loader that uses the DELETE + INSERT pattern
 to ensure no duplicate records in ClickHouse tables.
 """
 
+import asyncio
+import random
 import pandas as pd
 from typing import List, Optional, Dict, Any
-from core.config import config
+from core.clickhouse import clickhouse_write_breaker, get_shared_clickhouse_client
 from core.logging import log_with_timestamp
-from .data_utils import clean_data_for_clickhouse, deduplicate_data
+from .data_utils import clean_data_for_clickhouse, deduplicate_data, get_clickhouse_insert_settings
 
 async def load_to_clickhouse_with_replace(
     data: pd.DataFrame,
@@ -19,7 +21,8 @@ async def load_to_clickhouse_with_replace(
     sort_column: str = 'updated_at_trade',
     string_columns: Optional[List[str]] = None,
     max_retries: int = 3,
-    name: str = "ClickHouse Replace Loader"
+    name: str = "ClickHouse Replace Loader",
+    delete_existing: bool = True
 ) -> bool:
     """
     Load data to ClickHouse using DELETE + INSERT pattern to ensure no duplicates.
@@ -32,6 +35,9 @@ async def load_to_clickhouse_with_replace(
         string_columns: List of string columns to clean (optional)
         max_retries: Maximum number of retry attempts
         name: Name for logging purposes
+        delete_existing: Delete existing rows for the batch keys before inserting.
+            Disable for ReplacingMergeTree tables whose version column already
+            supersedes older rows, to avoid a DELETE mutation per batch
         
     Returns:
         True if successful, False otherwise
@@ -42,29 +48,45 @@ async def load_to_clickhouse_with_replace(
 
     log_with_timestamp(f"Loading {len(data)} records to ClickHouse", name)
     
-    # Get all unique key values from the current batch
-    key_values = data[key_columns[0]].dropna().unique().tolist()
+    # Rows without a key cannot be deduplicated or replaced, so drop them before any other work
+    data = data.dropna(subset=key_columns[:1])
     
-    if not key_values:
+    if data.empty:
         log_with_timestamp(f"No valid {key_columns[0]} found in data", name, "warning")
         return False
     
+    # Get all unique key values from the current batch
+    key_values = data[key_columns[0]].unique().tolist()
+    
     # Deduplicate data at application level before inserting
     data_deduplicated = deduplicate_data(data, key_columns, sort_column)
+
+    # Send rows ordered by key (the tables' sorting key) so ClickHouse can skip
+    # most of the sort when it forms the new part
+    data_deduplicated = data_deduplicated.sort_values(key_columns, ignore_index=True)
+
+    # Insert settings depend on the (thread-local) backfill state, so resolve them here
+    insert_settings = get_clickhouse_insert_settings()
+    
+    def _replace(cleaned_data: pd.DataFrame) -> None:
+        client = get_shared_clickhouse_client()
+        
+        # Use REPLACE approach to ensure no duplicates
+        # First, delete existing records for these key values
+        if delete_existing:
+            delete_query = f"ALTER TABLE {table_name} DELETE WHERE {key_columns[0]} IN %(key_values)s"
+            client.command(delete_query, parameters={'key_values': tuple(key_values)})
+        
+        # Then insert the new data
+        client.insert_df(table_name, cleaned_data, settings=insert_settings)
     
     # Use direct insert approach with DELETE + INSERT pattern
     for attempt in range(max_retries):
+        if not clickhouse_write_breaker.allow():
+            log_with_timestamp(f"ClickHouse circuit breaker is open, skipping load to {table_name}", name, "error")
+            return False
+        
         try:
-            import clickhouse_connect
-            clickhouse_config = config.get_clickhouse_config()
-            client = clickhouse_connect.get_client(
-                host=clickhouse_config['host'],
-                port=clickhouse_config['port'],
-                username=clickhouse_config['user'],
-                password=clickhouse_config['password'],
-                database=clickhouse_config['database']
-            )
-            
             # Clean data for ClickHouse insertion
             cleaned_data = clean_data_for_clickhouse(data_deduplicated, string_columns)
             
@@ -76,19 +98,15 @@ async def load_to_clickhouse_with_replace(
                 sample_timestamps = cleaned_data[sort_column].dropna().head(3).tolist()
                 log_with_timestamp(f"Sample {sort_column} timestamps: {sample_timestamps}", name)
             
-            # Use REPLACE approach to ensure no duplicates
-            # First, delete existing records for these key values
-            key_values_list = "', '".join(key_values)
-            delete_query = f"ALTER TABLE {table_name} DELETE WHERE {key_columns[0]} IN ('{key_values_list}')"
-            client.command(delete_query)
-            
-            # Then insert the new data
-            client.insert_df(table_name, cleaned_data)
+            # The ClickHouse client is blocking, so run it off the event loop
+            await asyncio.to_thread(_replace, cleaned_data)
+            clickhouse_write_breaker.record_success()
             
             log_with_timestamp(f"Successfully loaded {len(data_deduplicated)} records to {table_name}", name)
             return True
             
         except Exception as e:
+            clickhouse_write_breaker.record_failure()
             log_with_timestamp(f"Attempt {attempt + 1}/{max_retries} failed to load data to ClickHouse: {e}", name, "error")
             
             # Log additional debugging information
@@ -100,9 +118,8 @@ async def load_to_clickhouse_with_replace(
                 log_with_timestamp(f"All {max_retries} attempts failed to load data to ClickHouse", name, "error")
                 return False
             
-            # Wait before retrying
-            import time
-            time.sleep(2 ** attempt)  # Exponential backoff
+            # Full-jitter exponential backoff keeps concurrent pipelines from retrying in lockstep
+            await asyncio.sleep(random.uniform(0, 2 ** attempt))
     
     return False
 
@@ -112,7 +129,8 @@ def create_clickhouse_replace_loader(
     sort_column: str = 'updated_at_trade',
     string_columns: Optional[List[str]] = None,
     max_retries: int = 3,
-    name: str = "ClickHouse Replace Loader"
+    name: str = "ClickHouse Replace Loader",
+    delete_existing: bool = True
 ) -> callable:
     """
     Create a ClickHouse replace loader function with pre-configured parameters.
@@ -124,6 +142,7 @@ def create_clickhouse_replace_loader(
         string_columns: List of string columns to clean (optional)
         max_retries: Maximum number of retry attempts
         name: Name for logging purposes
+        delete_existing: Delete existing rows for the batch keys before inserting
         
     Returns:
         Async function that performs the replace load operation
@@ -144,7 +163,8 @@ def create_clickhouse_replace_loader(
             sort_column=sort_column,
             string_columns=string_columns,
             max_retries=max_retries,
-            name=name
+            name=name,
+            delete_existing=delete_existing
         )
     
     return clickhouse_replace_loader_func
@@ -7,9 +7,14 @@ across different pipelines.
 """
 
 import pandas as pd
-from datetime import datetime
+import time
 from typing import List, Optional, Dict, Any
+from core.constants import CLICKHOUSE_ASYNC_INSERT_SETTINGS
 from core.logging import log_with_timestamp
+from .backfill_utils import backfill_manager
+
+UNIX_EPOCH = pd.Timestamp(0, tz='UTC')
+MIN_VALID_TIMESTAMP = 1000000000  # 2001-09-09; anything earlier is treated as bad data
 
 def convert_to_timestamp(series: pd.Series, field_name: str) -> pd.Series:
     """
@@ -27,52 +32,39 @@ def convert_to_timestamp(series: pd.Series, field_name: str) -> pd.Series:
     
     # Special handling for date_of_birth - set to None to avoid issues
     if field_name == 'date_of_birth':
-        return pd.Series([None] * len(series), dtype='object')
+        return pd.Series([None] * len(series), index=series.index, dtype='object')
     
     # Log the original values for debugging
     log_with_timestamp(f"Converting {field_name} - Original values: {series.head(3).tolist()}", "Timestamp Converter")
     
-    # Convert to datetime first, handling various formats
-    datetime_series = pd.to_datetime(series, errors='coerce', utc=True)
+    # Convert to datetime first. format='ISO8601' uses pandas' C ISO parser for every
+    # value instead of inferring one format from the first value, which turned
+    # differently shaped ISO strings (fractional seconds, offsets) into NaT
+    datetime_series = pd.to_datetime(series, errors='coerce', utc=True, format='ISO8601')
+    
+    # Epoch numbers and non-ISO strings become NaT above; report them rather than
+    # letting bad data disappear silently
+    unparsed = int(datetime_series.isna().sum() - series.isna().sum())
+    if unparsed > 0:
+        log_with_timestamp(f"Warning: {unparsed} {field_name} values could not be parsed as ISO 8601 datetimes, set to None", "Timestamp Converter", "warning")
     
     # Log the converted datetime values
     log_with_timestamp(f"Converted to datetime - Values: {datetime_series.head(3).tolist()}", "Timestamp Converter")
     
-    # Convert to Unix timestamp (seconds since epoch)
-    def convert_single_timestamp(ts):
-        if pd.isna(ts):
-            return None
-        try:
-            # Ensure we have a proper datetime object
-            if hasattr(ts, 'timestamp'):
-                timestamp = int(ts.timestamp())
-                # Validate timestamp is reasonable (not 1 or very small)
-                if timestamp < 1000000000:  # Before year 2001
-                    log_with_timestamp(f"Warning: Very small timestamp {timestamp} for {field_name}", "Timestamp Converter", "warning")
-                    return None
-                return timestamp
-            else:
-                # If it's already a timestamp, return as is
-                timestamp = int(ts)
-                if timestamp < 1000000000:  # Before year 2001
-                    log_with_timestamp(f"Warning: Very small timestamp {timestamp} for {field_name}", "Timestamp Converter", "warning")
-                    return None
-                return timestamp
-        except (ValueError, AttributeError, TypeError) as e:
-            log_with_timestamp(f"Error converting timestamp for {field_name}: {e}", "Timestamp Converter", "error")
-            return None
-    
-    timestamp_series = datetime_series.apply(convert_single_timestamp)
+    # Convert to Unix timestamps (seconds since epoch) in one vectorized pass;
+    # the result is int64, or float64 with NaN where values are missing
+    timestamp_series = (datetime_series - UNIX_EPOCH) // pd.Timedelta(seconds=1)
+    
+    # Reject unreasonable timestamps (before year 2001)
+    too_small = timestamp_series < MIN_VALID_TIMESTAMP
+    if too_small.any():
+        log_with_timestamp(f"Warning: {int(too_small.sum())} very small timestamps for {field_name}, set to None", "Timestamp Converter", "warning")
+        timestamp_series = timestamp_series.mask(too_small)
     
     # Log some sample conversions for debugging
     if not timestamp_series.empty:
         sample_values = timestamp_series.dropna().head(3).tolist()
         log_with_timestamp(f"Sample {field_name} timestamps: {sample_values}", "Timestamp Converter")
-        
-        # Check for any remaining 1 values
-        ones_count = (timestamp_series == 1).sum()
-        if ones_count > 0:
-            log_with_timestamp(f"Warning: {ones_count} records still have timestamp value 1 for {field_name}", "Timestamp Converter", "warning")
     
     return timestamp_series
 
@@ -156,14 +148,12 @@ def add_merge_metadata(data: pd.DataFrame, pipeline_name: str, merge_status: str
     Returns:
         DataFrame with added metadata columns
     """
-    data_copy = data.copy()
-    
-    # Add merge metadata with timestamp
-    data_copy['merged_at'] = int(datetime.now().timestamp())
-    data_copy['merge_status'] = merge_status
-    data_copy['pipeline_name'] = pipeline_name
-    
-    return data_copy
+    # Add merge metadata with timestamp; assign copies the frame once for all three columns
+    return data.assign(
+        merged_at=int(time.time()),
+        merge_status=merge_status,
+        pipeline_name=pipeline_name
+    )
 
 def prepare_datetime_columns(data: pd.DataFrame, datetime_mappings: Dict[str, str]) -> pd.DataFrame:
     """
@@ -176,15 +166,30 @@ def prepare_datetime_columns(data: pd.DataFrame, datetime_mappings: Dict[str, st
     Returns:
         DataFrame with converted datetime columns
     """
-    data_copy = data.copy()
+    present = [original_col for original_col in datetime_mappings if original_col in data.columns]
+    converted = {
+        datetime_mappings[original_col]: convert_to_timestamp(data[original_col], datetime_mappings[original_col])
+        for original_col in present
+    }
+    
+    # Drop the original columns to avoid conflicts, then add the converted ones;
+    # one drop and one assign copy the frame once instead of once per column
+    return data.drop(columns=present).assign(**converted)
+
+def get_clickhouse_insert_settings() -> Dict[str, Any]:
+    """
+    Get the ClickHouse settings to send with INSERT statements.
     
-    for original_col, new_col in datetime_mappings.items():
-        if original_col in data_copy.columns:
-            data_copy[new_col] = convert_to_timestamp(data_copy[original_col], new_col)
-            # Drop the original column to avoid conflicts
-            data_copy = data_copy.drop(columns=[original_col])
+    Inserts go through the server-side async insert buffer. Backfills wait for
+    the buffer flush so their writes are acknowledged before the next step.
     
-    return data_copy
+    Returns:
+        Dictionary of ClickHouse query settings
+    """
+    settings = dict(CLICKHOUSE_ASYNC_INSERT_SETTINGS)
+    if backfill_manager.is_backfill_mode():
+        settings['wait_for_async_insert'] = 1
+    return settings
 
 # Public API
 __all__ = [
@@ -193,4 +198,5 @@ __all__ = [
     'deduplicate_data',
     'add_merge_metadata',
     'prepare_datetime_columns',
+    'get_clickhouse_insert_settings',
 ]
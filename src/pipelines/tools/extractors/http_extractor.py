@@ -6,12 +6,14 @@ This module provides functionality to extract data from HTTP APIs,
 supporting various HTTP methods and authentication mechanisms.
 """
 
+from io import StringIO
 from typing import Optional, Dict, Any
 import asyncio
 import aiohttp
 import pandas as pd
 from core.config import config
 from core.logging import log_with_timestamp
+from .http_session import get_http_session, get_rate_limiter, read_json
 
 async def extract_from_http(
     url: str,
@@ -50,58 +52,60 @@ async def extract_from_http(
                 'User-Agent': 'Data-Processor/1.0'
             }
         
-        # Create session with timeout
         timeout_config = aiohttp.ClientTimeout(total=timeout)
         
-        async with aiohttp.ClientSession(timeout=timeout_config) as session:
-            # Prepare request arguments
-            request_kwargs = {
-                'headers': headers,
-                'params': params
-            }
+        session = await get_http_session()
+        # Prepare request arguments
+        request_kwargs = {
+            'headers': headers,
+            'params': params,
+            'timeout': timeout_config
+        }
+        
+        # Add data for POST/PUT requests
+        if data and method.upper() in ['POST', 'PUT', 'PATCH']:
+            request_kwargs['json'] = data
+        
+        # Wait for the host's rate limit, then make the HTTP request
+        rate_limiter = get_rate_limiter(url)
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        async with session.request(method.upper(), url, **request_kwargs) as response:
+            # Check if request was successful
+            response.raise_for_status()
             
-            # Add data for POST/PUT requests
-            if data and method.upper() in ['POST', 'PUT', 'PATCH']:
-                request_kwargs['json'] = data
+            # Get response content
+            content_type = response.headers.get('content-type', '').lower()
             
-            # Make the HTTP request
-            async with session.request(method.upper(), url, **request_kwargs) as response:
-                # Check if request was successful
-                response.raise_for_status()
+            if 'application/json' in content_type:
+                data = await read_json(response)
+                log_with_timestamp(f"Received JSON response with {len(data) if isinstance(data, list) else 1} records", name)
                 
-                # Get response content
-                content_type = response.headers.get('content-type', '').lower()
-                
-                if 'application/json' in content_type:
-                    data = await response.json()
-                    log_with_timestamp(f"Received JSON response with {len(data) if isinstance(data, list) else 1} records", name)
-                    
-                    # Convert to DataFrame
-                    if isinstance(data, list):
-                        df = pd.DataFrame(data)
-                    elif isinstance(data, dict):
-                        # If it's a single object, wrap it in a list
-                        df = pd.DataFrame([data])
-                    else:
-                        # If it's not a list or dict, create a single-row DataFrame
-                        df = pd.DataFrame([{'data': data}])
-                        
-                elif 'text/csv' in content_type:
-                    # Handle CSV response
-                    csv_content = await response.text()
-                    from io import StringIO
-                    df = pd.read_csv(StringIO(csv_content))
-                    log_with_timestamp(f"Received CSV response with {len(df)} records", name)
-                    
+                # Convert to DataFrame
+                if isinstance(data, list):
+                    df = pd.DataFrame(data)
+                elif isinstance(data, dict):
+                    # If it's a single object, wrap it in a list
+                    df = pd.DataFrame([data])
                 else:
-                    # Handle other content types as text
-                    text_content = await response.text()
-                    df = pd.DataFrame([{'content': text_content}])
-                    log_with_timestamp(f"Received text response with {len(text_content)} characters", name)
-                
-                log_with_timestamp(f"Successfully extracted {len(df)} records from {url}", name)
-                return df
+                    # If it's not a list or dict, create a single-row DataFrame
+                    df = pd.DataFrame([{'data': data}])
+                    
+            elif 'text/csv' in content_type:
+                # Handle CSV response
+                csv_content = await response.text()
+                df = pd.read_csv(StringIO(csv_content))
+                log_with_timestamp(f"Received CSV response with {len(df)} records", name)
                 
+            else:
+                # Handle other content types as text
+                text_content = await response.text()
+                df = pd.DataFrame([{'content': text_content}])
+                log_with_timestamp(f"Received text response with {len(text_content)} characters", name)
+            
+            log_with_timestamp(f"Successfully extracted {len(df)} records from {url}", name)
+            return df
+            
     except aiohttp.ClientError as e:
         error_msg = f"HTTP client error during extraction from {url}: {e}"
         log_with_timestamp(error_msg, name, "error")
@@ -0,0 +1,220 @@
+# src/pipelines/tools/extractors/http_session.py
+"""
+Shared HTTP session for extractors.
+
+Extractors reuse one aiohttp ClientSession per event loop instead of opening
+a new session (and paying connection setup, DNS and TLS handshakes) for every
+request. Pipelines close the session when their run completes.
+
+Example:
+    >>> session = await get_http_session()
+    >>> async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+    ...     data = await read_json(response)
+    >>> await close_http_session()
+"""
+
+import asyncio
+import json
+import time
+import weakref
+from typing import Any, Dict, Optional, Union
+from urllib.parse import urlsplit
+import aiohttp
+from core.config import config
+from core.exceptions import HTTPExtractionError
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Upper bound on a buffered response body, and the size of the chunks it is read in
+HTTP_MAX_RESPONSE_BYTES = 64 * 1024 * 1024
+HTTP_READ_CHUNK_SIZE = 64 * 1024
+
+# Connection pool sizing: extractors mostly talk to a single host (Metabase), so
+# the per-host cap is what bounds concurrency there
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 20
+# Keep idle connections around long enough to be reused across pagination pages
+HTTP_KEEPALIVE_TIMEOUT = 75
+
+# One session per event loop: aiohttp sessions cannot be shared across loops
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+# Rate limiters per event loop and host (their locks belong to one loop)
+_rate_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, TokenBucket]]" = weakref.WeakKeyDictionary()
+
+
+class TokenBucket:
+    """
+    Token bucket that spaces out requests to a host before they are sent.
+    
+    Tokens refill continuously at ``rate`` per second up to ``capacity``; each
+    request takes one token and waits for it when the bucket is empty. Waiters
+    are served in arrival order.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket full.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to one second of tokens, at least 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self) -> None:
+        """Take one token, waiting until one is available."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+    
+    def defer(self, delay: float) -> None:
+        """
+        Hold back the next request by at least ``delay`` seconds.
+        
+        Used when the server says how long to wait (e.g. a Retry-After header).
+        
+        Args:
+            delay: Seconds until the next request may be sent
+        """
+        self._refill()
+        self._tokens = min(self._tokens, 1 - delay * self.rate)
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared HTTP session for the running event loop, creating it on first use.
+
+    Returns:
+        aiohttp ClientSession with a pooled, DNS-caching connector
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=300,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT
+        )
+        session = aiohttp.ClientSession(connector=connector)
+        _sessions[loop] = session
+    return session
+
+
+def get_rate_limiter(url: str) -> Optional[TokenBucket]:
+    """
+    Get the rate limiter for a URL's host on the running event loop.
+    
+    Args:
+        url: Request URL
+        
+    Returns:
+        TokenBucket for the host, or None when HTTP_RATE_LIMIT is 0
+    """
+    rate = config.snapshot['http_rate_limit']
+    if rate <= 0:
+        return None
+    limiters = _rate_limiters.setdefault(asyncio.get_running_loop(), {})
+    host = urlsplit(url).netloc
+    limiter = limiters.get(host)
+    if limiter is None:
+        limiter = limiters[host] = TokenBucket(rate)
+    return limiter
+
+
+async def close_http_session() -> None:
+    """Close the shared HTTP session of the running event loop, if any."""
+    loop = asyncio.get_running_loop()
+    _rate_limiters.pop(loop, None)
+    session = _sessions.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+async def read_body(response: aiohttp.ClientResponse, max_bytes: int = HTTP_MAX_RESPONSE_BYTES) -> bytearray:
+    """
+    Read a response body in chunks, refusing bodies larger than max_bytes.
+    
+    Oversized responses are rejected from Content-Length when the server sends
+    it, and otherwise as soon as the streamed body passes the limit.
+    
+    Args:
+        response: aiohttp response to read
+        max_bytes: Maximum body size in bytes
+        
+    Returns:
+        The response body
+        
+    Raises:
+        HTTPExtractionError: If the body is larger than max_bytes
+    """
+    too_large = f"Response from {response.url} exceeds {max_bytes} bytes"
+    if response.content_length is not None and response.content_length > max_bytes:
+        raise HTTPExtractionError(too_large)
+    
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(HTTP_READ_CHUNK_SIZE):
+        body += chunk
+        if len(body) > max_bytes:
+            raise HTTPExtractionError(too_large)
+    return body
+
+
+def decode_json(body: Union[bytes, bytearray]) -> Any:
+    """
+    Decode a JSON body.
+    
+    Uses orjson when it is installed and falls back to the standard library.
+    
+    Args:
+        body: Raw JSON bytes
+        
+    Returns:
+        Decoded JSON value
+    """
+    return _json_loads(body)
+
+
+async def read_json(response: aiohttp.ClientResponse, max_bytes: int = HTTP_MAX_RESPONSE_BYTES) -> Any:
+    """
+    Read and decode a JSON response body.
+    
+    Args:
+        response: aiohttp response to read
+        max_bytes: Maximum body size in bytes
+        
+    Returns:
+        Decoded JSON value
+        
+    Raises:
+        HTTPExtractionError: If the body is larger than max_bytes
+    """
+    return decode_json(await read_body(response, max_bytes))
+
+
+# Public API
+__all__ = [
+    'get_http_session',
+    'close_http_session',
+    'get_rate_limiter',
+    'TokenBucket',
+    'read_body',
+    'decode_json',
+    'read_json',
+]
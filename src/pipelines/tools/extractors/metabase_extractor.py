@@ -16,12 +16,103 @@ Example:
     >>> data = await extractor()
 """
 
-from typing import List, Dict, Any, Callable, Optional, Union
+from typing import List, Dict, Any, Callable, Optional, Tuple, Union
 import asyncio
 import aiohttp
 import pandas as pd
 from core.config import config
 from core.logging import log_with_timestamp
+from .http_session import get_http_session, get_rate_limiter, read_body, decode_json
+
+# Transient statuses worth retrying: rate limiting and server-side failures
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+async def _request_with_retry(
+    session: aiohttp.ClientSession,
+    method: str,
+    url: str,
+    **kwargs: Any
+) -> Tuple[aiohttp.ClientResponse, bytearray]:
+    """
+    Send a request, retrying with exponential backoff on transient failures.
+    
+    Requests first pass the per-host rate limiter. Retries on connection errors,
+    timeouts and retryable statuses using the framework's max_retries,
+    retry_delay and retry_backoff settings. A numeric Retry-After header on 429
+    responses is honoured when it asks for longer, and also holds back other
+    requests to the same host. The body of the final response is read (within
+    the size cap of read_body) before the connection is released.
+    
+    Args:
+        session: HTTP session to send the request with
+        method: HTTP method
+        url: Request URL
+        **kwargs: Additional arguments passed to session.request
+        
+    Returns:
+        Tuple of the last response received and its body
+        
+    Raises:
+        HTTPExtractionError: If the response body is too large
+        aiohttp.ClientError: If the final attempt fails to connect
+        asyncio.TimeoutError: If the final attempt times out
+    """
+    settings = config.snapshot
+    max_retries = settings['max_retries']
+    rate_limiter = get_rate_limiter(url)
+    for attempt in range(max_retries + 1):
+        is_last_attempt = attempt == max_retries
+        delay = settings['retry_delay'] * settings['retry_backoff'] ** attempt
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                if response.status not in RETRYABLE_STATUSES or is_last_attempt:
+                    return response, await read_body(response)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if is_last_attempt:
+                raise
+            reason = str(e) or type(e).__name__
+        else:
+            reason = f"HTTP {response.status}"
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+                if rate_limiter is not None:
+                    rate_limiter.defer(float(retry_after))
+        
+        log_with_timestamp(
+            f"Metabase request failed ({reason}), retrying in {delay:.1f}s "
+            f"(attempt {attempt + 1}/{max_retries})",
+            "Metabase Extractor", "warning"
+        )
+        await asyncio.sleep(delay)
+
+
+def _result_to_dataframe(query_result: Dict[str, Any]) -> Optional[pd.DataFrame]:
+    """
+    Build a DataFrame from a Metabase dataset response.
+    
+    Args:
+        query_result: Decoded /api/dataset response
+        
+    Returns:
+        DataFrame named after the Metabase column metadata, or None if the result has no rows
+    """
+    data = query_result.get('data') or {}
+    rows = data.get('rows')
+    if not rows:
+        return None
+    
+    columns = data.get('cols')
+    if columns:
+        column_names = [col.get('display_name', f'col_{i}') for i, col in enumerate(columns)]
+    else:
+        # Fallback: use generic column names
+        column_names = [f'col_{i}' for i in range(len(rows[0]))]
+    
+    return pd.DataFrame(rows, columns=column_names)
 
 
 async def extract_from_metabase_table(
@@ -58,68 +149,52 @@ async def extract_from_metabase_table(
         # First, get table metadata to understand the structure
         table_url = f"{base_url.rstrip('/')}/api/table/{table_id}"
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-            # Get table metadata
-            async with session.get(table_url, headers=headers) as response:
-                if response.status == 401:
-                    log_with_timestamp("Metabase authentication failed. Check your API key.", "Metabase Extractor", "error")
-                    return pd.DataFrame()
-                elif response.status == 404:
-                    log_with_timestamp(f"Table {table_id} not found in Metabase", "Metabase Extractor", "error")
-                    return pd.DataFrame()
-                
-                response.raise_for_status()
-                table_metadata = await response.json()
-                
-                # Get table name and schema
-                table_name = table_metadata.get('name', f'table_{table_id}')
-                schema_name = table_metadata.get('schema', 'public')
-                
-                log_with_timestamp(f"Extracting from table: {schema_name}.{table_name}", "Metabase Extractor")
-                
-                # Build query to get all data from the table
-                query = {
-                    "database": database_id,
-                    "type": "query",
-                    "query": {
-                        "source-table": table_id,
-                        "limit": limit,
-                        "offset": offset
-                    }
-                }
-                
-                # Execute the query
-                query_url = f"{base_url.rstrip('/')}/api/dataset"
+        request_timeout = aiohttp.ClientTimeout(total=timeout)
+        session = await get_http_session()
+        # Get table metadata
+        response, body = await _request_with_retry(session, 'GET', table_url, headers=headers, timeout=request_timeout)
+        if response.status == 401:
+            log_with_timestamp("Metabase authentication failed. Check your API key.", "Metabase Extractor", "error")
+            return pd.DataFrame()
+        elif response.status == 404:
+            log_with_timestamp(f"Table {table_id} not found in Metabase", "Metabase Extractor", "error")
+            return pd.DataFrame()
+        
+        response.raise_for_status()
+        table_metadata = decode_json(body)
+        
+        # Get table name and schema
+        table_name = table_metadata.get('name', f'table_{table_id}')
+        schema_name = table_metadata.get('schema', 'public')
+        
+        log_with_timestamp(f"Extracting from table: {schema_name}.{table_name}", "Metabase Extractor")
+        
+        # Build query to get all data from the table
+        query = {
+            "database": database_id,
+            "type": "query",
+            "query": {
+                "source-table": table_id,
+                "limit": limit,
+                "offset": offset
+            }
+        }
+        
+        # Execute the query
+        query_url = f"{base_url.rstrip('/')}/api/dataset"
+        
+        query_response, query_body = await _request_with_retry(session, 'POST', query_url, headers=headers, json=query, timeout=request_timeout)
+        query_response.raise_for_status()
+        query_result = decode_json(query_body)
+        
+        df = _result_to_dataframe(query_result)
+        if df is None:
+            log_with_timestamp(f"No data found in table {table_name}", "Metabase Extractor", "warning")
+            return pd.DataFrame()
+        
+        log_with_timestamp(f"Successfully extracted {len(df)} rows from {table_name}", "Metabase Extractor")
+        return df
                 
-                async with session.post(query_url, headers=headers, json=query) as query_response:
-                    query_response.raise_for_status()
-                    query_result = await query_response.json()
-                    
-                    # Extract data from query result
-                    if 'data' in query_result and 'rows' in query_result['data']:
-                        rows = query_result['data']['rows']
-                        columns = query_result['data'].get('cols', [])
-                        
-                        if not rows:
-                            log_with_timestamp(f"No data found in table {table_name}", "Metabase Extractor", "warning")
-                            return pd.DataFrame()
-                        
-                        # Create column names from Metabase column metadata
-                        if columns:
-                            column_names = [col.get('display_name', f'col_{i}') for i, col in enumerate(columns)]
-                        else:
-                            # Fallback: use generic column names
-                            column_names = [f'col_{i}' for i in range(len(rows[0]) if rows else 0)]
-                        
-                        # Create DataFrame
-                        df = pd.DataFrame(rows, columns=column_names)
-                        
-                        log_with_timestamp(f"Successfully extracted {len(df)} rows from {table_name}", "Metabase Extractor")
-                        return df
-                    else:
-                        log_with_timestamp(f"No data found in query result for table {table_name}", "Metabase Extractor", "warning")
-                        return pd.DataFrame()
-                        
     except aiohttp.ClientError as e:
         log_with_timestamp(f"Network error during Metabase extraction: {e}", "Metabase Extractor", "error")
         return pd.DataFrame()
@@ -166,44 +241,28 @@ async def extract_from_metabase_query(
         
         query_url = f"{base_url.rstrip('/')}/api/dataset"
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-            async with session.post(query_url, headers=headers, json=query) as response:
-                if response.status == 401:
-                    log_with_timestamp("Metabase authentication failed. Check your API key.", "Metabase Extractor", "error")
-                    return pd.DataFrame()
-                elif response.status == 400:
-                    error_data = await response.json()
-                    log_with_timestamp(f"Query error: {error_data.get('message', 'Unknown error')}", "Metabase Extractor", "error")
-                    return pd.DataFrame()
-                
-                response.raise_for_status()
-                query_result = await response.json()
+        request_timeout = aiohttp.ClientTimeout(total=timeout)
+        session = await get_http_session()
+        response, body = await _request_with_retry(session, 'POST', query_url, headers=headers, json=query, timeout=request_timeout)
+        if response.status == 401:
+            log_with_timestamp("Metabase authentication failed. Check your API key.", "Metabase Extractor", "error")
+            return pd.DataFrame()
+        elif response.status == 400:
+            error_data = decode_json(body)
+            log_with_timestamp(f"Query error: {error_data.get('message', 'Unknown error')}", "Metabase Extractor", "error")
+            return pd.DataFrame()
+        
+        response.raise_for_status()
+        query_result = decode_json(body)
+        
+        df = _result_to_dataframe(query_result)
+        if df is None:
+            log_with_timestamp("No data found in query result", "Metabase Extractor", "warning")
+            return pd.DataFrame()
+        
+        log_with_timestamp(f"Successfully extracted {len(df)} rows using native query", "Metabase Extractor")
+        return df
                 
-                # Extract data from query result
-                if 'data' in query_result and 'rows' in query_result['data']:
-                    rows = query_result['data']['rows']
-                    columns = query_result['data'].get('cols', [])
-                    
-                    if not rows:
-                        log_with_timestamp("No data found in query result", "Metabase Extractor", "warning")
-                        return pd.DataFrame()
-                    
-                    # Create column names from Metabase column metadata
-                    if columns:
-                        column_names = [col.get('display_name', f'col_{i}') for i, col in enumerate(columns)]
-                    else:
-                        # Fallback: use generic column names
-                        column_names = [f'col_{i}' for i in range(len(rows[0]) if rows else 0)]
-                    
-                    # Create DataFrame
-                    df = pd.DataFrame(rows, columns=column_names)
-                    
-                    log_with_timestamp(f"Successfully extracted {len(df)} rows using native query", "Metabase Extractor")
-                    return df
-                else:
-                    log_with_timestamp("No data found in query result", "Metabase Extractor", "warning")
-                    return pd.DataFrame()
-                    
     except aiohttp.ClientError as e:
         log_with_timestamp(f"Network error during Metabase query execution: {e}", "Metabase Extractor", "error")
         return pd.DataFrame()
@@ -237,18 +296,19 @@ async def get_metabase_databases(
         
         databases_url = f"{base_url.rstrip('/')}/api/database"
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-            async with session.get(databases_url, headers=headers) as response:
-                if response.status == 401:
-                    log_with_timestamp("Metabase authentication failed. Check your API key.", "Metabase Extractor", "error")
-                    return []
-                
-                response.raise_for_status()
-                databases = await response.json()
-                
-                log_with_timestamp(f"Found {len(databases)} databases in Metabase", "Metabase Extractor")
-                return databases.get("data", [])
-                
+        request_timeout = aiohttp.ClientTimeout(total=timeout)
+        session = await get_http_session()
+        response, body = await _request_with_retry(session, 'GET', databases_url, headers=headers, timeout=request_timeout)
+        if response.status == 401:
+            log_with_timestamp("Metabase authentication failed. Check your API key.", "Metabase Extractor", "error")
+            return []
+        
+        response.raise_for_status()
+        databases = decode_json(body)
+        
+        log_with_timestamp(f"Found {len(databases)} databases in Metabase", "Metabase Extractor")
+        return databases.get("data", [])
+            
     except Exception as e:
         log_with_timestamp(f"Error getting Metabase databases: {e}", "Metabase Extractor", "error")
         return []
@@ -281,31 +341,32 @@ async def get_metabase_tables(
         
         tables_url = f"{base_url.rstrip('/')}/api/database/{database_id}/metadata"
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-            async with session.get(tables_url, headers=headers) as response:
-                if response.status == 401:
-                    log_with_timestamp("Metabase authentication failed. Check your API key.", "Metabase Extractor", "error")
-                    return []
-                elif response.status == 404:
-                    log_with_timestamp(f"Database {database_id} not found in Metabase", "Metabase Extractor", "error")
-                    return []
-                
-                response.raise_for_status()
-                metadata = await response.json()
-                
-                tables = []
-                for table in metadata.get('tables', []):
-                    tables.append({
-                        'id': table.get('id'),
-                        'name': table.get('name'),
-                        'schema': table.get('schema'),
-                        'display_name': table.get('display_name'),
-                        'description': table.get('description')
-                    })
-                
-                log_with_timestamp(f"Found {len(tables)} tables in database {database_id}", "Metabase Extractor")
-                return tables
-                
+        request_timeout = aiohttp.ClientTimeout(total=timeout)
+        session = await get_http_session()
+        response, body = await _request_with_retry(session, 'GET', tables_url, headers=headers, timeout=request_timeout)
+        if response.status == 401:
+            log_with_timestamp("Metabase authentication failed. Check your API key.", "Metabase Extractor", "error")
+            return []
+        elif response.status == 404:
+            log_with_timestamp(f"Database {database_id} not found in Metabase", "Metabase Extractor", "error")
+            return []
+        
+        response.raise_for_status()
+        metadata = decode_json(body)
+        
+        tables = []
+        for table in metadata.get('tables', []):
+            tables.append({
+                'id': table.get('id'),
+                'name': table.get('name'),
+                'schema': table.get('schema'),
+                'display_name': table.get('display_name'),
+                'description': table.get('description')
+            })
+        
+        log_with_timestamp(f"Found {len(tables)} tables in database {database_id}", "Metabase Extractor")
+        return tables
+            
     except Exception as e:
         log_with_timestamp(f"Error getting Metabase tables: {e}", "Metabase Extractor", "error")
         return []
@@ -14,10 +14,17 @@ Example:
     >>> loader(dataframe)
 """
 
-from .clickhouse_loader import create_clickhouse_loader, create_clickhouse_upsert_loader
+from .clickhouse_loader import (
+    create_clickhouse_loader,
+    create_clickhouse_upsert_loader,
+    load_to_clickhouse_async,
+    upsert_to_clickhouse_async,
+)
 
 # Public API
 __all__ = [
     'create_clickhouse_loader',
     'create_clickhouse_upsert_loader',
+    'load_to_clickhouse_async',
+    'upsert_to_clickhouse_async',
 ]
@@ -1,10 +1,15 @@
 # src/loaders/clickhouse_loader.py
-from typing import Callable, Optional, List
+import asyncio
+import json
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 import pandas as pd
 import numpy as np
+from core.clickhouse import get_shared_clickhouse_client
 from core.config import config
 from core.logging import log_with_timestamp
+from ..data_utils import get_clickhouse_insert_settings
 
 
 def load_to_clickhouse(
@@ -16,55 +21,48 @@ def load_to_clickhouse(
     password: str = None,
     database: str = None,
     batch_size: int = None,
-    target_hour: Optional[datetime] = None
+    target_hour: Optional[datetime] = None,
+    insert_settings: Optional[Dict[str, Any]] = None
 ) -> bool:
     """
     Generic ClickHouse loader that works with pandas DataFrames.
+    
+    insert_settings defaults to get_clickhouse_insert_settings() for the calling thread.
     """
     try:
-        import clickhouse_connect
-
-        clickhouse_config = config.get_clickhouse_config()
-        client = clickhouse_connect.get_client(
-            host=host or clickhouse_config['host'],
-            port=port or clickhouse_config['port'],
-            username=user or clickhouse_config['user'],
-            password=password or clickhouse_config['password'],
-            database=database or clickhouse_config['database']
-        )
+        client = get_shared_clickhouse_client(host, port, user, password, database)
 
         if data.empty:
             log_with_timestamp(f"No data to load to ClickHouse table '{table_name}'", "ClickHouse Loader", "info")
             return True
 
-        # Convert DataFrame to list of dictionaries for ClickHouse
-        data_list = data.to_dict('records')
-        
-        # Handle NaN values and array data by converting to None
-        data_list = _normalize_data_for_clickhouse(data_list)
+        # Build one normalized list per column; inserting column-oriented avoids
+        # materializing a dict and a tuple per row
+        column_names = list(data.columns)
+        columns = [_normalize_column(data.iloc[:, position]) for position in range(len(column_names))]
+        row_count = len(data)
 
         batch_size = batch_size or config.get('BATCH_SIZE', 1000)
+        if insert_settings is None:
+            insert_settings = get_clickhouse_insert_settings()
         
-        log_with_timestamp(f"Loading {len(data_list)} records to ClickHouse table '{table_name}' in batches of {batch_size}...", "ClickHouse Loader")
+        log_with_timestamp(f"Loading {row_count} records to ClickHouse table '{table_name}' in batches of {batch_size}...", "ClickHouse Loader")
+
+        # One insert context (and so one schema lookup) is reused for every batch
+        context = client.create_insert_context(table_name, column_names, column_oriented=True, settings=insert_settings)
 
         # Load data in batches
-        for i in range(0, len(data_list), batch_size):
-            batch = data_list[i:i + batch_size]
+        for i in range(0, row_count, batch_size):
+            batch_columns = [column[i:i + batch_size] for column in columns]
+            batch_length = len(batch_columns[0])
             try:
-                # Convert batch to list of tuples for ClickHouse compatibility
-                batch_tuples = []
-                for record in batch:
-                    # Convert dict to tuple in the correct column order
-                    tuple_record = tuple(record.get(col, None) for col in data.columns)
-                    batch_tuples.append(tuple_record)
-                
-                client.insert(table_name, batch_tuples, column_names=list(data.columns))
-                log_with_timestamp(f"Loaded batch {i//batch_size + 1} ({len(batch)} records) to {table_name}", "ClickHouse Loader")
+                client.insert(data=batch_columns, context=context)
+                log_with_timestamp("Loaded batch %d (%d records) to %s", "ClickHouse Loader", "debug", i // batch_size + 1, batch_length, table_name)
             except Exception as e:
                 log_with_timestamp(f"Failed to load batch {i//batch_size + 1} to {table_name}: {e}", "ClickHouse Loader", "error")
                 return False
 
-        log_with_timestamp(f"Successfully loaded {len(data_list)} records to ClickHouse table '{table_name}'", "ClickHouse Loader")
+        log_with_timestamp(f"Successfully loaded {row_count} records to ClickHouse table '{table_name}'", "ClickHouse Loader")
         return True
 
     except Exception as e:
@@ -82,91 +80,102 @@ def upsert_to_clickhouse(
     password: str = None,
     database: str = None,
     batch_size: int = None,
-    protected_columns: List[str] = None
+    protected_columns: List[str] = None,
+    insert_settings: Optional[Dict[str, Any]] = None
 ) -> bool:
     """
     Upsert data to ClickHouse using pandas DataFrame.
-    Implements proper idempotent upsert using ALTER TABLE UPDATE for existing records
-    and INSERT for new records.
+    Relies on the target table being a ReplacingMergeTree ordered by the unique key:
+    every record is inserted in batches and the newer row supersedes the stored one
+    on merge, so no ALTER TABLE UPDATE mutations are issued. Readers that must not see
+    duplicates before a merge should query with FINAL.
+    
+    For records that already exist, missing (None/NaN) values are filled from the
+    stored row, so an upsert never blanks out a stored value.
     
     Args:
         data: DataFrame to upsert
         table_name: Target ClickHouse table name
         unique_key_columns: List of columns that form the unique key
-        protected_columns: List of columns that should not be updated (e.g., primary keys)
+        protected_columns: List of columns whose stored values are kept for existing records
         host, port, user, password, database: ClickHouse connection parameters
         batch_size: Number of records to process per batch
+        insert_settings: Insert settings (defaults to get_clickhouse_insert_settings() for the calling thread)
     """
     try:
-        import clickhouse_connect
-
-        clickhouse_config = config.get_clickhouse_config()
-        client = clickhouse_connect.get_client(
-            host=host or clickhouse_config['host'],
-            port=port or clickhouse_config['port'],
-            username=user or clickhouse_config['user'],
-            password=password or clickhouse_config['password'],
-            database=database or clickhouse_config['database']
-        )
+        client = get_shared_clickhouse_client(host, port, user, password, database)
 
         if data.empty:
             log_with_timestamp(f"No data to upsert to ClickHouse table '{table_name}'", "ClickHouse Loader", "info")
             return True
 
-        # Convert DataFrame to list of dictionaries
-        data_list = data.to_dict('records')
+        # Rows without a usable key are dropped up front; list-valued keys would also
+        # make drop_duplicates fail for the whole frame
+        invalid_keys = _invalid_key_mask(data, unique_key_columns)
+        skipped = int(invalid_keys.sum())
+        if skipped:
+            log_with_timestamp(f"Skipping {skipped} records without valid unique key columns", "ClickHouse Loader", "warning")
+            data = data[~invalid_keys]
         
-        # Handle NaN values and array data
-        data_list = _normalize_data_for_clickhouse(data_list)
+        # Later rows win within a batch, and sending rows in sorting-key order lets
+        # ClickHouse skip most of the sort when it forms the new part
+        data = data.drop_duplicates(unique_key_columns, keep='last').sort_values(unique_key_columns, kind='stable', ignore_index=True)
+
+        # Build one normalized list per column and insert column-oriented, as load_to_clickhouse does
+        column_names = list(data.columns)
+        columns = [_normalize_column(data.iloc[:, position]) for position in range(len(column_names))]
+        row_count = len(data)
+        key_columns = [columns[column_names.index(col)] for col in unique_key_columns]
 
         batch_size = batch_size or config.get('BATCH_SIZE', 1000)
-        protected_columns = protected_columns or []
+        protected_columns = [col for col in (protected_columns or []) if col not in unique_key_columns]
+        protected_positions = [column_names.index(col) for col in protected_columns]
+        value_positions = [
+            position for position, col in enumerate(column_names)
+            if col not in unique_key_columns and col not in protected_columns
+        ]
+        if insert_settings is None:
+            insert_settings = get_clickhouse_insert_settings()
         
-        log_with_timestamp(f"Upserting {len(data_list)} records to ClickHouse table '{table_name}' (idempotent upsert) in batches of {batch_size}...", "ClickHouse Loader")
+        log_with_timestamp(f"Upserting {row_count} records to ClickHouse table '{table_name}' (idempotent upsert) in batches of {batch_size}...", "ClickHouse Loader")
+
+        # One insert context (and so one schema lookup) is reused for every batch
+        context = client.create_insert_context(table_name, column_names, column_oriented=True, settings=insert_settings)
 
         # Process data in batches for idempotent upsert
-        for i in range(0, len(data_list), batch_size):
-            batch = data_list[i:i + batch_size]
+        for i in range(0, row_count, batch_size):
             try:
-                # For each record in the batch, check if it exists and update or insert accordingly
-                for record in batch:
-                    # Build WHERE clause for checking existing records
-                    where_conditions = _build_where_conditions(unique_key_columns, record)
-                    
-                    if not where_conditions:
-                        log_with_timestamp(f"No valid unique key columns found for record, skipping: {record}", "ClickHouse Loader", "warning")
-                        continue
-                    
-                    # Check if record exists
-                    check_query = f"SELECT COUNT(*) FROM {table_name} WHERE {' AND '.join(where_conditions)}"
-                    qr = client.query(check_query)
-                    rows = qr.result_rows if hasattr(qr, 'result_rows') else []
-                    exists = rows[0][0] > 0 if rows else False
-                    
-                    if exists:
-                        # Update existing record
-                        update_columns = _build_update_columns(record, data.columns, unique_key_columns, protected_columns)
-                        
-                        if update_columns:
-                            update_query = f"""
-                                ALTER TABLE {table_name} 
-                                UPDATE {', '.join(update_columns)}
-                                WHERE {' AND '.join(where_conditions)}
-                            """
-                            client.command(update_query)
-                            log_with_timestamp(f"Updated existing record for {unique_key_columns} = {[record.get(k) for k in unique_key_columns]}", "ClickHouse Loader", "debug")
-                    else:
-                        # Insert new record
-                        insert_query = _build_insert_query(table_name, record, data.columns)
-                        client.command(insert_query)
-                        log_with_timestamp(f"Inserted new record for {unique_key_columns} = {[record.get(k) for k in unique_key_columns]}", "ClickHouse Loader", "debug")
+                batch_keys = list(zip(*(column[i:i + batch_size] for column in key_columns)))
+                batch_columns = [column[i:i + batch_size] for column in columns]
                 
-                log_with_timestamp(f"Processed batch {i//batch_size + 1} ({len(batch)} records) for {table_name}", "ClickHouse Loader")
+                # Stored values are kept for protected columns, and fill the value columns
+                # this batch leaves empty, as the row-by-row UPDATE that skipped None did
+                carried_positions = protected_positions + [
+                    position for position in value_positions
+                    if any(value is None for value in batch_columns[position])
+                ]
+                if carried_positions and batch_keys:
+                    stored = _fetch_stored_values(
+                        client, table_name, unique_key_columns,
+                        [column_names[position] for position in carried_positions], batch_keys
+                    )
+                    protected_count = len(protected_positions)
+                    for row, key in enumerate(batch_keys):
+                        values = stored.get(key)
+                        if values is None:
+                            continue
+                        for index, (position, value) in enumerate(zip(carried_positions, values)):
+                            if index < protected_count or batch_columns[position][row] is None:
+                                batch_columns[position][row] = value
+                
+                if batch_keys:
+                    client.insert(data=batch_columns, context=context)
+                log_with_timestamp("Processed batch %d (%d records) for %s", "ClickHouse Loader", "debug", i // batch_size + 1, len(batch_keys), table_name)
             except Exception as e:
                 log_with_timestamp(f"Failed to upsert batch {i//batch_size + 1} to {table_name}: {e}", "ClickHouse Loader", "error")
                 return False
 
-        log_with_timestamp(f"Successfully upserted {len(data_list)} records to ClickHouse table '{table_name}' (idempotent)", "ClickHouse Loader")
+        log_with_timestamp(f"Successfully upserted {row_count} records to ClickHouse table '{table_name}' (idempotent)", "ClickHouse Loader")
         return True
 
     except Exception as e:
@@ -174,126 +183,131 @@ def upsert_to_clickhouse(
         return False
 
 
-def _normalize_data_for_clickhouse(data_list: List[dict]) -> List[dict]:
-    """Normalize data for ClickHouse compatibility."""
-    for record in data_list:
-        for key, value in record.items():
-            # Convert Decimal to float for ClickHouse Float/Decimal columns
-            try:
-                from decimal import Decimal
-                if isinstance(value, Decimal):
-                    record[key] = float(value)
-                    value = record[key]
-            except Exception:
-                pass
-            
-            # Normalize numpy scalar types
-            try:
-                import numpy as _np
-                if isinstance(value, (_np.float32, _np.float64)):
-                    record[key] = float(value)
-                    value = record[key]
-                elif isinstance(value, (_np.int32, _np.int64)):
-                    record[key] = int(value)
-                    value = record[key]
-            except Exception:
-                pass
-            
-            # Handle NaN values
-            if pd.isna(value) or (isinstance(value, float) and np.isnan(value)):
-                record[key] = None
-            elif isinstance(value, dict):
-                # Convert dict to JSON string
-                import json
-                try:
-                    record[key] = json.dumps(value)
-                except Exception:
-                    record[key] = str(value)
-            elif isinstance(value, np.ndarray):
-                # Convert numpy arrays to Python lists
-                record[key] = value.tolist()
-            elif hasattr(value, 'tolist'):
-                # Convert pandas arrays to Python lists
-                record[key] = value.tolist()
-            elif isinstance(value, list):
-                # Handle lists properly
-                try:
-                    record[key] = [str(item) if item is not None else None for item in value]
-                except Exception:
-                    record[key] = None
-            elif isinstance(value, str) and value == '':
-                record[key] = None  # Convert empty strings to None for ClickHouse
+async def load_to_clickhouse_async(data: pd.DataFrame, table_name: str, **kwargs: Any) -> bool:
+    """
+    Run load_to_clickhouse on a worker thread so the event loop keeps serving other tasks.
+    
+    Insert settings are resolved in the calling thread, where the backfill state lives.
     
-    return data_list
+    Args:
+        data: DataFrame to load
+        table_name: Target ClickHouse table name
+        **kwargs: Additional arguments passed to load_to_clickhouse
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    kwargs.setdefault('insert_settings', get_clickhouse_insert_settings())
+    return await asyncio.to_thread(load_to_clickhouse, data, table_name, **kwargs)
 
 
-def _build_where_conditions(unique_key_columns: List[str], record: dict) -> List[str]:
-    """Build WHERE conditions for unique key columns."""
-    where_conditions = []
+async def upsert_to_clickhouse_async(
+    data: pd.DataFrame,
+    table_name: str,
+    unique_key_columns: List[str],
+    **kwargs: Any
+) -> bool:
+    """
+    Run upsert_to_clickhouse on a worker thread so the event loop keeps serving other tasks.
     
-    for col in unique_key_columns:
-        if col in record and record[col] is not None:
-            val = record[col]
-            if isinstance(val, str):
-                # Escape single quotes in strings
-                escaped_val = val.replace("'", "''")
-                where_conditions.append(f"{col} = '{escaped_val}'")
-            elif isinstance(val, datetime):
-                where_conditions.append(f"{col} = '{val.strftime('%Y-%m-%d %H:%M:%S')}'")
-            elif isinstance(val, list):
-                # Skip array columns in WHERE clause as they can cause comparison issues
-                continue
-            else:
-                where_conditions.append(f"{col} = {val}")
+    Insert settings are resolved in the calling thread, where the backfill state lives.
     
-    return where_conditions
+    Args:
+        data: DataFrame to upsert
+        table_name: Target ClickHouse table name
+        unique_key_columns: List of columns that form the unique key
+        **kwargs: Additional arguments passed to upsert_to_clickhouse
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    kwargs.setdefault('insert_settings', get_clickhouse_insert_settings())
+    return await asyncio.to_thread(upsert_to_clickhouse, data, table_name, unique_key_columns, **kwargs)
 
 
-def _build_update_columns(record: dict, all_columns: List[str], unique_key_columns: List[str], protected_columns: List[str]) -> List[str]:
-    """Build UPDATE columns list."""
-    update_columns = []
-    
-    for col in all_columns:
-        if (col not in unique_key_columns and 
-            col not in protected_columns and 
-            col in record and record[col] is not None):
-            val = record[col]
-            if isinstance(val, str):
-                escaped_val = val.replace("'", "''")
-                update_columns.append(f"{col} = '{escaped_val}'")
-            elif isinstance(val, datetime):
-                update_columns.append(f"{col} = '{val.strftime('%Y-%m-%d %H:%M:%S')}'")
-            else:
-                update_columns.append(f"{col} = {val}")
-    
-    return update_columns
+def _normalize_column(column: pd.Series) -> list:
+    """Normalize one DataFrame column into a list of ClickHouse-compatible Python values."""
+    values = column.tolist()
+    if isinstance(column.dtype, np.dtype):
+        # NumPy integer/boolean columns cannot hold missing values; floats only need NaN mapped
+        if column.dtype.kind in 'iub':
+            return values
+        if column.dtype.kind == 'f':
+            return [None if value != value else value for value in values]
+    return [_normalize_value(value) for value in values]
+
 
+def _normalize_value(value: Any) -> Any:
+    """Normalize a single value for ClickHouse compatibility."""
+    if value is None:
+        return None
+    value_type = type(value)
+    if value_type is float:
+        return None if value != value else value
+    if value_type is int or value_type is bool:
+        return value
+    if isinstance(value, str):
+        return None if value == '' else value  # Convert empty strings to None for ClickHouse
+    if isinstance(value, dict):
+        # Convert dict to JSON string
+        try:
+            return json.dumps(value)
+        except (TypeError, ValueError):
+            return str(value)
+    if isinstance(value, (list, tuple)):
+        return [str(item) if item is not None else None for item in value]
+    if isinstance(value, np.ndarray):
+        # Convert numpy arrays to Python lists
+        return value.tolist()
+    # Scalars: Decimal and numpy types become Python values, NaN/NaT become None
+    if isinstance(value, Decimal):
+        value = float(value)
+    if pd.isna(value):
+        return None
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return value
 
-def _build_insert_query(table_name: str, record: dict, columns: List[str]) -> str:
-    """Build INSERT query for a single record."""
-    insert_columns = list(columns)
-    insert_values = []
+
+def _invalid_key_mask(data: pd.DataFrame, unique_key_columns: List[str]) -> pd.Series:
+    """
+    Flag rows whose unique key cannot be matched against stored records.
     
-    for col in insert_columns:
-        val = record.get(col, None)
-        if val is None:
-            insert_values.append('NULL')
-        elif isinstance(val, str):
-            # Escape single quotes in strings and handle JSON
-            escaped_val = val.replace("'", "''")
-            # Check if it's a JSON string (starts with { or [)
-            if escaped_val.strip().startswith(('{', '[')):
-                # For JSON strings, use proper escaping
-                escaped_val = escaped_val.replace('\\', '\\\\')
-            insert_values.append(f"'{escaped_val}'")
-        elif isinstance(val, datetime):
-            insert_values.append(f"'{val.strftime('%Y-%m-%d %H:%M:%S')}'")
-        elif isinstance(val, (int, float)):
-            insert_values.append(str(val))
-        else:
-            insert_values.append(f"'{str(val)}'")
+    A key is invalid when any of its values is missing, an empty string (stored
+    as NULL) or a list-like value, which is also unhashable for drop_duplicates.
+    """
+    invalid = data[unique_key_columns].isna().any(axis=1)
+    for column in unique_key_columns:
+        if not pd.api.types.is_numeric_dtype(data[column]):
+            invalid |= data[column].map(
+                lambda value: isinstance(value, (list, tuple, dict, set, np.ndarray))
+                or (isinstance(value, str) and value == '')
+            ).astype(bool)
+    return invalid
+
+
+def _fetch_stored_values(
+    client,
+    table_name: str,
+    unique_key_columns: List[str],
+    value_columns: List[str],
+    keys: List[Tuple[Any, ...]]
+) -> Dict[Tuple[Any, ...], Tuple[Any, ...]]:
+    """Fetch stored values of the given columns for a batch of unique keys in a single query."""
+    if len(unique_key_columns) == 1:
+        key_expression = unique_key_columns[0]
+        key_values = tuple(key[0] for key in keys)
+    else:
+        key_expression = f"({', '.join(unique_key_columns)})"
+        key_values = tuple(keys)
     
-    return f"INSERT INTO {table_name} ({', '.join(insert_columns)}) VALUES ({', '.join(insert_values)})"
+    query = (
+        f"SELECT {', '.join(unique_key_columns + value_columns)} FROM {table_name} "
+        f"WHERE {key_expression} IN %(keys)s"
+    )
+    rows = client.query(query, parameters={'keys': key_values}).result_rows
+    key_count = len(unique_key_columns)
+    return {tuple(row[:key_count]): tuple(row[key_count:]) for row in rows}
 
 
 def create_clickhouse_loader(
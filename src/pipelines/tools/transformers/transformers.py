@@ -3,6 +3,7 @@ from typing import Callable, Optional
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from zoneinfo import ZoneInfo
 from core.logging import log_with_timestamp
 
 def apply_transform(
@@ -180,10 +181,14 @@ def create_timezone_converter(
     
     Args:
         timezone_columns: List of datetime columns to convert
-        from_tz: Source timezone
-        to_tz: Target timezone
+        from_tz: Source timezone for naive values (IANA name)
+        to_tz: Target timezone (IANA name)
         name: Name for logging
     """
+    # Resolve the zones once, not per column on every call
+    from_zone = ZoneInfo(from_tz)
+    to_zone = ZoneInfo(to_tz)
+    
     def transform_func(df: pd.DataFrame) -> pd.DataFrame:
         if df.empty:
             return df
@@ -194,11 +199,14 @@ def create_timezone_converter(
             if column in df_converted.columns:
                 try:
                     # Convert to datetime if not already
-                    if not pd.api.types.is_datetime64_any_dtype(df_converted[column]):
-                        df_converted[column] = pd.to_datetime(df_converted[column])
+                    values = df_converted[column]
+                    if not pd.api.types.is_datetime64_any_dtype(values):
+                        values = pd.to_datetime(values)
                     
-                    # Convert timezone
-                    df_converted[column] = df_converted[column].dt.tz_localize(from_tz).dt.tz_convert(to_tz)
+                    # Localize naive values to the source zone, then convert
+                    if values.dt.tz is None:
+                        values = values.dt.tz_localize(from_zone)
+                    df_converted[column] = values.dt.tz_convert(to_zone)
                 except Exception as e:
                     log_with_timestamp(f"Failed to convert timezone for column {column}: {e}", name, "warning")
                     
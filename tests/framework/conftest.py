@@ -100,7 +100,7 @@ def test_env():
     
     # Setup logging for tests
     os.makedirs(test_env_vars['LOG_DIR'], exist_ok=True)
-    setup_logging('DEBUG')
+    setup_logging('DEBUG', reload_config=True)
     
     yield {
         'temp_dir': temp_dir,
@@ -361,7 +361,7 @@ class TestOperationalScenarios:
             os.environ['LOG_DIR'] = temp_log_dir
             
             # Setup logging should create directories
-            setup_logging('INFO')
+            setup_logging('INFO', reload_config=True)
             
             # Check directories were created
             assert os.path.exists(temp_log_dir)
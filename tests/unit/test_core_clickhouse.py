@@ -0,0 +1,121 @@
+"""
+Core Framework Tests - ClickHouse Client Factory
+
+Tests for the shared ClickHouse client factory including:
+- Connection parameters taken from configuration
+- Explicit parameter overrides
+- Wire compression defaults
+- Shared connection pool
+- Per-thread client reuse
+- Table row counts
+- Write circuit breaker
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.clickhouse import CircuitBreaker, get_clickhouse_client, get_shared_clickhouse_client, get_table_row_counts
+from core.config import config
+
+
+class TestCoreClickHouse:
+    """Test ClickHouse client factory."""
+    
+    def test_client_uses_config(self):
+        """Test that connection parameters default to configuration."""
+        with patch('clickhouse_connect.get_client') as mock_get_client:
+            get_clickhouse_client()
+        
+        ch_config = config.get_clickhouse_config()
+        kwargs = mock_get_client.call_args.kwargs
+        assert kwargs['host'] == ch_config['host']
+        assert kwargs['port'] == ch_config['port']
+        assert kwargs['username'] == ch_config['user']
+        assert kwargs['database'] == ch_config['database']
+        assert kwargs['compress'] == 'lz4'
+    
+    def test_shared_client_reused_per_thread(self):
+        """Test that shared clients are reused for the same settings but not across threads."""
+        import threading
+        
+        with patch('clickhouse_connect.get_client', side_effect=lambda **kwargs: MagicMock()) as mock_get_client:
+            first = get_shared_clickhouse_client(database='shared_test')
+            assert get_shared_clickhouse_client(database='shared_test') is first
+            assert get_shared_clickhouse_client(database='shared_test_other') is not first
+            
+            other_thread = []
+            thread = threading.Thread(target=lambda: other_thread.append(get_shared_clickhouse_client(database='shared_test')))
+            thread.start()
+            thread.join()
+        
+        assert other_thread[0] is not first
+        assert mock_get_client.call_count == 3
+    
+    def test_compression_from_config(self, monkeypatch):
+        """Test that the configured compression codec is used, and 'none' disables it."""
+        ch_config = {**config.get_clickhouse_config(), 'compression': 'none'}
+        monkeypatch.setattr(config, 'get_clickhouse_config', lambda: ch_config)
+        with patch('clickhouse_connect.get_client') as mock_get_client:
+            get_clickhouse_client()
+        assert mock_get_client.call_args.kwargs['compress'] is False
+    
+    def test_clients_share_connection_pool(self):
+        """Test that every client draws connections from one process-wide pool."""
+        with patch('clickhouse_connect.get_client') as mock_get_client:
+            get_clickhouse_client()
+            get_clickhouse_client(host='ch.example.com')
+        
+        first, second = (call.kwargs['pool_mgr'] for call in mock_get_client.call_args_list)
+        assert first is second
+        assert first.connection_pool_kw['maxsize'] == config.get_clickhouse_config()['pool_size']
+    
+    def test_client_overrides(self):
+        """Test that explicit parameters override configuration."""
+        with patch('clickhouse_connect.get_client') as mock_get_client:
+            get_clickhouse_client(host='ch.example.com', database='analytics', compress=False)
+        
+        kwargs = mock_get_client.call_args.kwargs
+        assert kwargs['host'] == 'ch.example.com'
+        assert kwargs['database'] == 'analytics'
+        assert kwargs['compress'] is False
+
+    
+    def test_table_row_counts(self):
+        """Test that row counts come from one catalog query."""
+        client = MagicMock()
+        client.query.return_value.result_rows = [('migrations', 2), ('trades', 100), ('trades_view', None)]
+        
+        counts = get_table_row_counts(client, 'analytics')
+        
+        assert counts == {'migrations': 2, 'trades': 100, 'trades_view': None}
+        client.query.assert_called_once()
+        assert client.query.call_args.kwargs['parameters'] == {'database': 'analytics'}
+    
+    def test_circuit_breaker_opens_and_rearms(self):
+        """Test that the breaker rejects calls after the threshold until the cool-down passes."""
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=30)
+        
+        with patch('core.clickhouse.time.monotonic', return_value=100.0):
+            breaker.record_failure()
+            assert breaker.allow()
+            breaker.record_failure()
+            assert not breaker.allow()
+        
+        with patch('core.clickhouse.time.monotonic', return_value=131.0):
+            assert breaker.allow()
+            # A failed probe re-opens the breaker straight away
+            breaker.record_failure()
+            assert not breaker.allow()
+        
+        breaker.record_success()
+        assert breaker.allow()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
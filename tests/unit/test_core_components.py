@@ -115,7 +115,7 @@ class TestLoggingSystem:
             log_with_timestamp("Debug message", "TestUnit", "debug")
             
             # Test with category
-            log_with_timestamp("Categorized message", "TestUnit", "info", "test_category")
+            log_with_timestamp("Categorized message", "TestUnit", "info", category="test_category")
             
             duration = time.time() - start_time
             test_results_collector.add_result(
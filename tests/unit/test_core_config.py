@@ -17,7 +17,7 @@ from unittest.mock import patch
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from core.config import config, Config
+from core.config import config, Config, load_env_file
 from core.exceptions import ConfigurationError
 
 
@@ -85,6 +85,13 @@ class TestCoreConfig:
         assert 'log_level' in config_dict
         assert 'timeout' in config_dict
     
+    def test_config_snapshot(self):
+        """Test the read-only settings snapshot."""
+        snapshot = config.snapshot
+        assert snapshot['log_level'] == config.log_level
+        with pytest.raises(TypeError):
+            snapshot['log_level'] = 'DEBUG'
+    
     def test_config_reload(self):
         """Test configuration reload."""
         # This should not raise an exception
@@ -97,6 +104,7 @@ class TestCoreConfig:
         original_timeout = config.timeout
         config.update(timeout=60)
         assert config.timeout == 60
+        assert config.get('TIMEOUT') == 60
         
         # Restore original value
         config.update(timeout=original_timeout)
@@ -119,6 +127,23 @@ class TestCoreConfig:
         # Test with invalid configuration
         with pytest.raises(ConfigurationError):
             config.update(invalid_field='invalid_value')
+    
+    def test_load_env_file(self, tmp_path, monkeypatch):
+        """Test .env parsing and environment precedence."""
+        env_file = tmp_path / '.env'
+        env_file.write_text('# comment\nDP_TEST_A=1\nDP_TEST_B = "quoted value"\n\nDP_TEST_C=file\n')
+        monkeypatch.setenv('DP_TEST_C', 'env')
+        monkeypatch.delenv('DP_TEST_A', raising=False)
+        monkeypatch.delenv('DP_TEST_B', raising=False)
+        
+        values = load_env_file(env_file)
+        
+        assert values == {'DP_TEST_A': '1', 'DP_TEST_B': 'quoted value', 'DP_TEST_C': 'file'}
+        import os
+        assert os.environ['DP_TEST_A'] == '1'
+        assert os.environ['DP_TEST_C'] == 'env'
+        # Second load of the same file is a no-op
+        assert load_env_file(env_file) == {}
 
 
 if __name__ == '__main__':
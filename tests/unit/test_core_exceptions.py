@@ -19,7 +19,7 @@ sys.path.insert(0, str(project_root))
 from core.exceptions import (
     FrameworkError, ConfigurationError, DatabaseError,
     PipelineError, ExtractionError, TransformationError,
-    LoadingError, MigrationError, ValidationError,
+    LoadingError, MigrationError, ValidationError, RetryError,
     create_exception
 )
 
@@ -40,6 +40,14 @@ class TestCoreExceptions:
         assert str(error) == "Test error message | Details: {'field': 'value', 'code': 123}"
         assert error.details == details
     
+    def test_retry_error_string(self):
+        """Test RetryError string with and without last error and details."""
+        assert str(RetryError("Load failed", 3, None)) == "Load failed (after 3 attempts)"
+        error = RetryError("Load failed", 3, ValueError("timeout"), {"table": "trades"})
+        assert str(error) == (
+            "Load failed (after 3 attempts) | Last error: timeout | Details: {'table': 'trades'}"
+        )
+    
     def test_configuration_error(self):
         """Test ConfigurationError."""
         error = ConfigurationError("Configuration error")
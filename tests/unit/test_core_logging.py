@@ -11,6 +11,7 @@ Tests for the core logging system including:
 import pytest
 import sys
 import logging
+import time
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -22,7 +23,7 @@ from core.logging import (
     setup_logging, log_with_timestamp, get_logger,
     LoggingContext, PerformanceLogger,
     log_function_call, log_pipeline_stage,
-    create_job_logger
+    create_job_logger, BufferedHandler, BufferedFileHandler, TehranFormatter
 )
 
 
@@ -37,6 +38,9 @@ class TestCoreLogging:
         # Verify root logger is configured
         root_logger = logging.getLogger()
         assert root_logger.level <= logging.INFO
+        
+        with pytest.raises(ValueError):
+            setup_logging('VERBOSE')
     
     def test_log_with_timestamp(self):
         """Test timestamped logging."""
@@ -45,6 +49,48 @@ class TestCoreLogging:
         log_with_timestamp("Warning message", "TestCategory", "warning")
         log_with_timestamp("Error message", "TestCategory", "error")
     
+    def test_log_with_timestamp_lazy_args(self, caplog):
+        """Test that placeholder args are applied on emit and suppressed levels are skipped."""
+        with caplog.at_level(logging.INFO):
+            log_with_timestamp("Loaded %d records to %s", "TestCategory", "info", 5, "trades")
+            log_with_timestamp("Hidden %s", "TestCategory", "debug", "detail")
+            log_with_timestamp("Batch %d done", "Loader", "info", 3, category="upsert")
+        
+        messages = [record.getMessage() for record in caplog.records]
+        assert len(messages) == 2
+        assert messages[0].endswith("TestCategory: Loaded 5 records to trades")
+        assert messages[1].endswith("Loader[upsert]: Batch 3 done")
+    
+    def test_log_with_timestamp_level_names(self, caplog):
+        """Test that level names resolve regardless of case, with unknown names logged at INFO."""
+        with caplog.at_level(logging.DEBUG):
+            for level in ('warning', 'WARNING', 'Warning', 'verbose'):
+                log_with_timestamp("Level check", "TestCategory", level)
+        
+        assert [record.levelno for record in caplog.records] == [
+            logging.WARNING, logging.WARNING, logging.WARNING, logging.INFO
+        ]
+    
+    def test_tehran_formatter(self):
+        """Test that asctime is rendered in Tehran time (UTC+3:30) and the message is not re-stamped."""
+        record = logging.makeLogRecord({'msg': 'Loader: done', 'levelname': 'INFO', 'created': 0.0})
+        formatter = TehranFormatter('[%(asctime)s] %(levelname)s: %(message)s')
+        assert formatter.format(record) == '[1970-01-01 03:30:00] INFO: Loader: done'
+        assert TehranFormatter('%(asctime)s', datefmt='%H:%M').format(record) == '03:30'
+    
+    def test_logging_context_attributes(self, caplog):
+        """Test that context attributes are added to records, merged when nested and removed on exit."""
+        logger = logging.getLogger("context_test")
+        with caplog.at_level(logging.INFO):
+            with LoggingContext("Outer", job_id="123"):
+                with LoggingContext("Inner", pipeline="trades"):
+                    logger.info("inside")
+            logger.info("outside")
+        
+        inside, outside = caplog.records
+        assert (inside.job_id, inside.pipeline) == ("123", "trades")
+        assert not hasattr(outside, "job_id")
+    
     def test_get_logger(self):
         """Test logger creation."""
         logger = get_logger("test_logger")
@@ -92,6 +138,35 @@ class TestCoreLogging:
         job_logger = create_job_logger("test_job")
         assert isinstance(job_logger, logging.Logger)
         assert "test_job" in job_logger.name
+        
+        # Repeat calls are served from the memo without any setup work
+        import core.logging as core_logging
+        with patch.object(core_logging.logging, 'getLogger') as get_logger_mock, \
+                patch.object(core_logging, 'get_job_log_path') as get_path, \
+                patch.object(core_logging, 'BufferedFileHandler') as handler_class:
+            assert create_job_logger("test_job") is job_logger
+        get_logger_mock.assert_not_called()
+        get_path.assert_not_called()
+        handler_class.assert_not_called()
+    
+    def test_job_logger_writes_through_queue(self, tmp_path, monkeypatch):
+        """Test that job records are written to the job file by the listener thread."""
+        import core.logging as core_logging
+        monkeypatch.setattr(core_logging, 'JOB_LOG_DIR', str(tmp_path))
+        
+        job_logger = create_job_logger("queued_job")
+        other_logger = create_job_logger("other_queued_job")
+        assert isinstance(job_logger.handlers[0], logging.handlers.QueueHandler)
+        # Every job shares the one queue drained by the listener thread
+        assert job_logger.handlers[0].queue is other_logger.handlers[0].queue
+        job_logger.error("job failed")
+        
+        log_path = tmp_path / "queued_job.log"
+        deadline = time.time() + 2
+        while (not log_path.exists() or "job failed" not in log_path.read_text()) and time.time() < deadline:
+            time.sleep(0.01)
+        assert "ERROR - job.queued_job - job failed" in log_path.read_text()
+        assert not (tmp_path / "other_queued_job.log").read_text()
     
     def test_logging_levels(self):
         """Test different logging levels."""
@@ -130,6 +205,45 @@ class TestCoreLogging:
         assert logger1.name == "logger1"
         assert logger2.name == "logger2"
     
+    def test_buffered_handler_flushes_on_interval(self):
+        """Test buffered handler writes records after the flush interval."""
+        import time
+        target = MagicMock(spec=logging.Handler)
+        handler = BufferedHandler(target, capacity=100, flush_interval=0.01)
+        try:
+            handler.handle(logging.makeLogRecord({'msg': 'buffered', 'levelno': logging.INFO}))
+            deadline = time.time() + 1
+            while not target.handle.called and time.time() < deadline:
+                time.sleep(0.01)
+            assert target.handle.called
+        finally:
+            handler.close()
+        target.close.assert_called_once()
+    
+    def test_buffered_file_handler_flushes_on_warning(self, tmp_path):
+        """Test that INFO records stay buffered until a flush or a WARNING record."""
+        log_path = tmp_path / 'buffered.log'
+        handler = BufferedFileHandler(str(log_path))
+        try:
+            handler.handle(logging.makeLogRecord({'msg': 'info line', 'levelno': logging.INFO}))
+            assert log_path.read_text() == ''
+            handler.handle(logging.makeLogRecord({'msg': 'warning line', 'levelno': logging.WARNING}))
+            assert log_path.read_text() == 'info line\nwarning line\n'
+        finally:
+            handler.close()
+    
+    def test_buffered_file_handler_rotates(self, tmp_path):
+        """Test that the file is rotated once it would grow past max_bytes."""
+        log_path = tmp_path / 'rotating.log'
+        handler = BufferedFileHandler(str(log_path), max_bytes=20, backup_count=1)
+        try:
+            for msg in ('first line', 'second line', 'third line'):
+                handler.handle(logging.makeLogRecord({'msg': msg, 'levelno': logging.WARNING}))
+            assert log_path.read_text() == 'third line\n'
+            assert (tmp_path / 'rotating.log.1').read_text() == 'second line\n'
+        finally:
+            handler.close()
+    
     def test_logging_configuration(self):
         """Test logging configuration."""
         # Test with different log levels
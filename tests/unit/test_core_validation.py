@@ -28,8 +28,9 @@ from core.pydantic_validators import (
     validate_config, validate_pipeline_config,
     validate_extractor_config, validate_transformer_config,
     validate_loader_config, validate_dataframe,
-    safe_validate
+    safe_validate, PydanticValidator
 )
+from core.models import HTTPExtractorConfig, ConsoleLoaderConfig
 from core.exceptions import ValidationError
 
 
@@ -152,6 +153,11 @@ class TestCoreValidation:
         result = validate_pipeline_config(valid_pipeline)
         assert hasattr(result, 'name')
         assert result.name == 'test_pipeline'
+        
+        # Cron schedules need exactly five fields
+        for schedule in ('0 * * *', '0 * * * * *', ''):
+            with pytest.raises(ValidationError):
+                validate_pipeline_config({'name': 'test_pipeline', 'schedule': schedule})
     
     def test_pydantic_extractor_validation(self):
         """Test Pydantic extractor validation."""
@@ -163,8 +169,13 @@ class TestCoreValidation:
         }
         
         result = validate_extractor_config(valid_extractor)
-        assert hasattr(result, 'type')
+        assert isinstance(result, HTTPExtractorConfig)
         assert result.type == 'http'
+        
+        # Each type's required field is enforced, and unknown types are rejected
+        for invalid_extractor in ({'type': 'http'}, {'type': 'clickhouse', 'query': ''}, {'type': 'ftp'}):
+            with pytest.raises(ValidationError):
+                validate_extractor_config(invalid_extractor)
     
     def test_pydantic_transformer_validation(self):
         """Test Pydantic transformer validation."""
@@ -190,6 +201,23 @@ class TestCoreValidation:
         result = validate_loader_config(valid_loader)
         assert hasattr(result, 'type')
         assert result.type == 'clickhouse'
+        
+        with pytest.raises(ValidationError):
+            validate_loader_config({'type': 'clickhouse'})
+        assert validate_loader_config({'type': 'console'}).table is None
+    
+    def test_config_union_registry_validation(self):
+        """Test that registry validation dispatches the extractor and loader unions on type."""
+        result = safe_validate({'type': 'file', 'file_path': 'data.csv'}, 'extractor_config')
+        assert result.is_valid is True
+        assert result.data['file_path'] == 'data.csv'
+        
+        result = safe_validate({'type': 'clickhouse'}, 'loader_config')
+        assert result.is_valid is False
+        assert result.errors == ['clickhouse.table: Field required']
+        
+        loader = PydanticValidator.validate_with_model_name({'type': 'console'}, 'loader_config')
+        assert isinstance(loader, ConsoleLoaderConfig)
     
     def test_pydantic_dataframe_validation(self):
         """Test Pydantic DataFrame validation."""
@@ -228,6 +256,36 @@ class TestCoreValidation:
         assert result.is_valid is False
         assert len(result.errors) > 0
     
+    def test_safe_validation_model_registry(self):
+        """Test safe validation of plain models and unknown model names."""
+        result = safe_validate({'name': 'trades', 'schedule': '*/5 * * * *'}, 'pipeline_config')
+        assert result.is_valid is True
+        assert result.data['name'] == 'trades'
+        assert result.data['retry_count'] == 3
+        
+        result = safe_validate({'name': ''}, 'pipeline_config')
+        assert result.is_valid is False
+        assert result.errors == ['name: String should have at least 1 character']
+        
+        result = safe_validate({}, 'no_such_model')
+        assert result.is_valid is False
+        assert 'Unknown model' in result.errors[0]
+    
+    def test_safe_validation_strict(self):
+        """Test that strict validation rejects coercion but still returns validated data."""
+        result = safe_validate({'base_url': 'https://x.com/'}, 'api_config', strict=True)
+        assert result.is_valid is True
+        assert result.data['base_url'] == 'https://x.com'
+        assert result.data['timeout'] == 30
+        
+        result = safe_validate({'name': 'trades', 'retry_count': '5'}, 'pipeline_config', strict=True)
+        assert result.is_valid is False
+        assert result.errors[0].startswith('retry_count:')
+        
+        result = safe_validate({'max_retries': '7'}, 'framework_settings', strict=True)
+        assert result.is_valid is False
+        assert 'not supported' in result.errors[0]
+    
     def test_validation_error_handling(self):
         """Test validation error handling."""
         # Test that validation errors include proper context
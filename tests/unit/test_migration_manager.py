@@ -2,6 +2,7 @@
 Unit tests for migration manager functionality.
 """
 
+import hashlib
 import pytest
 import sys
 from pathlib import Path
@@ -53,3 +54,66 @@ class TestMigrationManager:
         except Exception as e:
             # Expected if database is not available
             assert "connection" in str(e).lower() or "database" in str(e).lower()
+    
+    def test_run_migrations_reads_executed_once(self, tmp_path, monkeypatch):
+        """Test that a run queries the migrations table once and assigns sequential ids."""
+        from unittest.mock import MagicMock
+        
+        (tmp_path / "001_first.sql").write_text("SELECT 1;")
+        (tmp_path / "002_second.sql").write_text("SELECT 2;")
+        (tmp_path / "003_third.sql").write_text("SELECT 3;")
+        
+        manager = ClickHouseMigrationManager()
+        manager.migrations_dir = tmp_path
+        manager.client = MagicMock()
+        manager.client.query.return_value.result_rows = [("001_first",)]
+        monkeypatch.setattr(manager, "connect", lambda: True)
+        
+        assert manager.run_migrations() is True
+        assert manager.client.query.call_count == 1
+        inserts = [c.args[1][0] for c in manager.client.insert.call_args_list]
+        assert inserts[0][:2] == [2, '002_second']
+        assert inserts[1][:2] == [3, '003_third']
+        # Checksums are the SHA-1 of the file contents
+        assert inserts[0][2] == hashlib.sha1(b"SELECT 2;").hexdigest()
+    
+    def test_run_migrations_creates_table_only_when_missing(self, tmp_path, monkeypatch):
+        """Test that the tracking table DDL is only sent when reading it fails."""
+        from unittest.mock import MagicMock
+        from migrations.migration_manager import MIGRATIONS_TABLE_DDL
+        
+        manager = ClickHouseMigrationManager()
+        manager.migrations_dir = tmp_path
+        manager.client = MagicMock()
+        monkeypatch.setattr(manager, "connect", lambda: True)
+        
+        manager.client.query.return_value.result_rows = []
+        assert manager.run_migrations() is True
+        manager.client.command.assert_not_called()
+        
+        manager.client.query.side_effect = Exception("UNKNOWN_TABLE")
+        assert manager.run_migrations() is True
+        manager.client.command.assert_called_once_with(MIGRATIONS_TABLE_DDL)
+    
+    def test_split_sql_statements_skips_comment_only_chunks(self):
+        """Test that comment-only chunks are not sent as statements."""
+        from migrations.migration_manager import split_sql_statements
+        
+        sql = "-- header\nCREATE TABLE t (id UInt32) ENGINE = Memory;\n\n-- trailing note\n;\nSELECT 1;\n-- end\n"
+        assert split_sql_statements(sql) == [
+            "-- header\nCREATE TABLE t (id UInt32) ENGINE = Memory",
+            "SELECT 1",
+        ]
+    
+    def test_schema_checked_once_per_process(self, monkeypatch):
+        """Test that ensure_database_schema retries after a failure but runs migrations only until they succeed."""
+        from unittest.mock import patch
+        import main
+        
+        monkeypatch.setattr(main, '_schema_ready', False)
+        with patch.object(main, 'ClickHouseMigrationManager') as manager_class:
+            manager_class.return_value.run_migrations.side_effect = [False, True]
+            assert main.ensure_database_schema() is False
+            assert main.ensure_database_schema() is True
+            assert main.ensure_database_schema() is True
+        assert manager_class.return_value.run_migrations.call_count == 2
@@ -0,0 +1,52 @@
+"""
+Unit tests for the ClickHouse upsert loader.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from pipelines.tools.loaders import clickhouse_loader
+
+
+def _upsert(data, client, **kwargs):
+    """Run upsert_to_clickhouse against a mock client."""
+    with patch.object(clickhouse_loader, 'get_shared_clickhouse_client', return_value=client):
+        return clickhouse_loader.upsert_to_clickhouse(data, 'trades', ['key'], insert_settings={}, **kwargs)
+
+
+class TestUpsertToClickHouse:
+    """Test the ReplacingMergeTree upsert path."""
+    
+    def test_invalid_keys_are_skipped(self):
+        """Test that missing, empty and list-valued keys skip their rows instead of failing the load."""
+        client = MagicMock()
+        data = pd.DataFrame({'key': ['a', ['b'], None, 'd', 'd', ''], 'value': [1, 2, 3, 4, 5, 6]})
+        
+        assert _upsert(data, client) is True
+        client.insert.assert_called_once()
+        assert client.insert.call_args.kwargs['data'] == [['a', 'd'], [1, 5]]
+    
+    def test_missing_values_keep_stored_values(self):
+        """Test that None/NaN fields of existing records are filled from the stored row."""
+        client = MagicMock()
+        client.query.return_value.result_rows = [('a', 10.0, 'stored note')]
+        data = pd.DataFrame({'key': ['a', 'b'], 'price': [None, 2.0], 'note': [None, None]})
+        
+        assert _upsert(data, client) is True
+        assert "SELECT key, price, note FROM trades" in client.query.call_args.args[0]
+        assert client.insert.call_args.kwargs['data'] == [['a', 'b'], [10.0, 2.0], ['stored note', None]]
+    
+    def test_protected_columns_keep_stored_values(self):
+        """Test that protected columns always keep the stored value, and no lookup is made without gaps."""
+        client = MagicMock()
+        client.query.return_value.result_rows = [('a', 'first seen')]
+        data = pd.DataFrame({'key': ['a'], 'created': ['now'], 'price': [1.0]})
+        
+        assert _upsert(data, client, protected_columns=['created']) is True
+        assert "SELECT key, created FROM trades" in client.query.call_args.args[0]
+        assert client.insert.call_args.kwargs['data'] == [['a'], ['first seen'], [1.0]]
+        
+        client.reset_mock()
+        assert _upsert(data, client) is True
+        client.query.assert_not_called()
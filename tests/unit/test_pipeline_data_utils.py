@@ -0,0 +1,24 @@
+"""
+Unit tests for the pipeline data utilities.
+"""
+
+import logging
+
+import pandas as pd
+
+from pipelines.tools.data_utils import convert_to_timestamp
+
+
+class TestConvertToTimestamp:
+    """Test datetime to Unix timestamp conversion."""
+    
+    def test_unparsed_values_are_reported(self, caplog):
+        """Test that values the ISO parser rejects become None and are counted in a warning."""
+        series = pd.Series(['2024-01-01T00:00:00Z', '2024-01-01 00:00:00.5+03:30', 1704067200, '01/02/2024', None])
+        
+        with caplog.at_level(logging.WARNING):
+            result = convert_to_timestamp(series, 'updated_at')
+        
+        assert result.tolist()[:2] == [1704067200, 1704054600]
+        assert result.iloc[2:].isna().all()
+        assert any("2 updated_at values could not be parsed" in record.getMessage() for record in caplog.records)
@@ -0,0 +1,69 @@
+"""
+Unit tests for the shared HTTP session helpers.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from core.exceptions import HTTPExtractionError
+from pipelines.tools.extractors.http_session import TokenBucket, read_json
+
+
+def _fake_response(chunks, content_length=None):
+    """Build a minimal stand-in for an aiohttp response streaming the given chunks."""
+    async def iter_chunked(size):
+        for chunk in chunks:
+            yield chunk
+    
+    return SimpleNamespace(
+        url="http://example.test/data",
+        content_length=content_length,
+        content=SimpleNamespace(iter_chunked=iter_chunked)
+    )
+
+
+class TestTokenBucket:
+    """Test the per-host token bucket rate limiter."""
+    
+    def test_burst_then_throttle(self):
+        """Test that a full bucket allows a burst and then spaces requests by the rate."""
+        async def run():
+            bucket = TokenBucket(rate=20, capacity=2)
+            start = time.monotonic()
+            for _ in range(4):
+                await bucket.acquire()
+            return time.monotonic() - start
+        
+        elapsed = asyncio.run(run())
+        # Two tokens are available immediately, the next two take 1/20s each
+        assert 0.08 <= elapsed < 0.5
+    
+    def test_defer_holds_back_next_request(self):
+        """Test that defer delays the next acquire by at least the given time."""
+        async def run():
+            bucket = TokenBucket(rate=100)
+            bucket.defer(0.1)
+            start = time.monotonic()
+            await bucket.acquire()
+            return time.monotonic() - start
+        
+        assert asyncio.run(run()) >= 0.09
+
+
+class TestReadJson:
+    """Test streamed, size-capped JSON reading."""
+    
+    def test_reads_chunked_body(self):
+        """Test that a body split across chunks is decoded."""
+        response = _fake_response([b'{"rows": [1, ', b'2, 3]}'])
+        assert asyncio.run(read_json(response)) == {"rows": [1, 2, 3]}
+    
+    def test_rejects_oversized_body(self):
+        """Test that bodies over the cap are rejected, with or without Content-Length."""
+        with pytest.raises(HTTPExtractionError):
+            asyncio.run(read_json(_fake_response([b"[]"], content_length=100), max_bytes=10))
+        with pytest.raises(HTTPExtractionError):
+            asyncio.run(read_json(_fake_response([b"[1, 2, ", b"3, 4, 5]"]), max_bytes=10))